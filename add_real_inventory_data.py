@@ -5,33 +5,44 @@ Run this script when you need to add actual inventory data for testing purposes
 """
 
 import os
-import sys
-import django
 
-# Setup Django environment
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sweetbite_backend.settings')
-django.setup()
+import bootstrap  # noqa: F401  Sets up Django
 
 from inventory.models import Supplier, Ingredient, StockMovement
 from django.contrib.auth import get_user_model
+from django.db import connection, transaction
 from django.utils import timezone
 from datetime import timedelta
 import random
 
 User = get_user_model()
 
+# Rows per INSERT statement for the bulk seed writes
+BATCH_SIZE = int(os.environ.get('SEED_BATCH_SIZE', 100))
+
+def upsert_options(update_fields):
+    """bulk_create kwargs for an upsert on the unique `name` column"""
+    options = {'update_conflicts': True, 'update_fields': update_fields}
+    # MySQL's ON DUPLICATE KEY UPDATE takes no conflict target
+    if connection.features.supports_update_conflicts_with_target:
+        options['unique_fields'] = ['name']
+    return options
+
+@transaction.atomic
 def add_real_inventory_data():
     """Add real inventory data for testing purposes"""
     
     print('📦 Adding Real Inventory Data...')
     
     # Get admin user
-    admin_user = User.objects.filter(user_type='admin').first()
-    if not admin_user:
+    admin_user_id = User.objects.filter(user_type='admin').values_list('id', flat=True).first()
+    if not admin_user_id:
         print('❌ No admin user found. Please create an admin user first.')
         return
     
+    # Progress messages are written in one go once the DB work is done
+    log_lines = []
+    
     # Create real suppliers
     suppliers_data = [
         {
@@ -60,119 +71,100 @@ def add_real_inventory_data():
         },
     ]
     
-    suppliers = []
-    for supplier_data in suppliers_data:
-        supplier, created = Supplier.objects.get_or_create(
-            name=supplier_data['name'],
-            defaults=supplier_data
-        )
-        suppliers.append(supplier)
-        if created:
-            print(f'✅ Created supplier: {supplier.name}')
+    supplier_names = [d['name'] for d in suppliers_data]
+    existing_suppliers = set(
+        Supplier.objects.filter(name__in=supplier_names).values_list('name', flat=True)
+    )
+    # Single INSERT ... ON CONFLICT/ON DUPLICATE KEY UPDATE keyed on the unique name
+    Supplier.objects.bulk_create(
+        [Supplier(**d) for d in suppliers_data],
+        batch_size=BATCH_SIZE,
+        **upsert_options(['contact_person', 'email', 'phone', 'address', 'notes'])
+    )
+    suppliers_by_name = {s.name: s for s in Supplier.objects.filter(name__in=supplier_names)}
+    suppliers = [suppliers_by_name[name] for name in supplier_names]
+    for supplier in suppliers:
+        if supplier.name in existing_suppliers:
+            log_lines.append(f'ℹ️ Supplier already exists: {supplier.name}')
         else:
-            print(f'ℹ️ Supplier already exists: {supplier.name}')
+            log_lines.append(f'✅ Created supplier: {supplier.name}')
     
     # Create real ingredients
+    # Column-oriented (one list per field) so numeric columns can be checked
+    # in a single pass and large CSV imports can slot in column by column
+    ingredient_columns = {
+        'name': [
+            'All-Purpose Flour',
+            'Granulated Sugar',
+            'Unsalted Butter',
+            'Fresh Eggs',
+            'Pure Vanilla Extract',
+            'Dark Chocolate Chips',
+            'Baking Powder',
+            'Sea Salt',
+        ],
+        'description': [
+            'High-quality all-purpose flour for baking',
+            'Fine granulated sugar for baking and cooking',
+            'Premium unsalted butter for baking',
+            'Farm-fresh eggs for baking',
+            'Pure vanilla extract for flavoring',
+            'Premium dark chocolate chips',
+            'Double-acting baking powder',
+            'Fine sea salt for seasoning',
+        ],
+        'unit': ['kg', 'kg', 'kg', 'pcs', 'ml', 'kg', 'g', 'g'],
+        'current_stock': [25.0, 15.0, 8.0, 120.0, 250.0, 5.0, 500.0, 1000.0],
+        'minimum_stock': [5.0, 3.0, 2.0, 30.0, 50.0, 1.0, 100.0, 200.0],
+        'unit_cost': [2.50, 3.00, 8.50, 0.30, 0.05, 12.00, 0.02, 0.01],
+        'location': ['Storage Room A', 'Storage Room A', 'Refrigerator', 'Refrigerator', 'Spice Cabinet', 'Storage Room B', 'Spice Cabinet', 'Spice Cabinet'],
+        'supplier_id': [suppliers[i].pk for i in (0, 0, 1, 1, 2, 2, 0, 0)],
+    }
+    
+    below_minimum = [
+        name for name, current, minimum in zip(
+            ingredient_columns['name'],
+            ingredient_columns['current_stock'],
+            ingredient_columns['minimum_stock']
+        )
+        if current < minimum
+    ]
+    if below_minimum:
+        print(f'❌ Seed stock is below minimum for: {", ".join(below_minimum)}')
+        return
+    
     ingredients_data = [
-        {
-            'name': 'All-Purpose Flour',
-            'description': 'High-quality all-purpose flour for baking',
-            'unit': 'kg',
-            'current_stock': 25.0,
-            'minimum_stock': 5.0,
-            'unit_cost': 2.50,
-            'supplier': suppliers[0],
-            'location': 'Storage Room A'
-        },
-        {
-            'name': 'Granulated Sugar',
-            'description': 'Fine granulated sugar for baking and cooking',
-            'unit': 'kg',
-            'current_stock': 15.0,
-            'minimum_stock': 3.0,
-            'unit_cost': 3.00,
-            'supplier': suppliers[0],
-            'location': 'Storage Room A'
-        },
-        {
-            'name': 'Unsalted Butter',
-            'description': 'Premium unsalted butter for baking',
-            'unit': 'kg',
-            'current_stock': 8.0,
-            'minimum_stock': 2.0,
-            'unit_cost': 8.50,
-            'supplier': suppliers[1],
-            'location': 'Refrigerator'
-        },
-        {
-            'name': 'Fresh Eggs',
-            'description': 'Farm-fresh eggs for baking',
-            'unit': 'pcs',
-            'current_stock': 120.0,
-            'minimum_stock': 30.0,
-            'unit_cost': 0.30,
-            'supplier': suppliers[1],
-            'location': 'Refrigerator'
-        },
-        {
-            'name': 'Pure Vanilla Extract',
-            'description': 'Pure vanilla extract for flavoring',
-            'unit': 'ml',
-            'current_stock': 250.0,
-            'minimum_stock': 50.0,
-            'unit_cost': 0.05,
-            'supplier': suppliers[2],
-            'location': 'Spice Cabinet'
-        },
-        {
-            'name': 'Dark Chocolate Chips',
-            'description': 'Premium dark chocolate chips',
-            'unit': 'kg',
-            'current_stock': 5.0,
-            'minimum_stock': 1.0,
-            'unit_cost': 12.00,
-            'supplier': suppliers[2],
-            'location': 'Storage Room B'
-        },
-        {
-            'name': 'Baking Powder',
-            'description': 'Double-acting baking powder',
-            'unit': 'g',
-            'current_stock': 500.0,
-            'minimum_stock': 100.0,
-            'unit_cost': 0.02,
-            'supplier': suppliers[0],
-            'location': 'Spice Cabinet'
-        },
-        {
-            'name': 'Sea Salt',
-            'description': 'Fine sea salt for seasoning',
-            'unit': 'g',
-            'current_stock': 1000.0,
-            'minimum_stock': 200.0,
-            'unit_cost': 0.01,
-            'supplier': suppliers[0],
-            'location': 'Spice Cabinet'
-        },
+        dict(zip(ingredient_columns, row)) for row in zip(*ingredient_columns.values())
     ]
     
-    ingredients = []
-    for ingredient_data in ingredients_data:
-        ingredient, created = Ingredient.objects.get_or_create(
-            name=ingredient_data['name'],
-            defaults=ingredient_data
-        )
-        ingredients.append(ingredient)
-        if created:
-            print(f'✅ Created ingredient: {ingredient.name}')
+    ingredient_names = ingredient_columns['name']
+    existing_ingredients = set(
+        Ingredient.objects.filter(name__in=ingredient_names).values_list('name', flat=True)
+    )
+    # current_stock is left out of the update so re-seeding keeps real stock levels
+    Ingredient.objects.bulk_create(
+        [Ingredient(**d) for d in ingredients_data],
+        batch_size=BATCH_SIZE,
+        **upsert_options(['description', 'unit', 'minimum_stock', 'unit_cost', 'supplier', 'location'])
+    )
+    ingredients_by_name = {i.name: i for i in Ingredient.objects.filter(name__in=ingredient_names)}
+    ingredients = [ingredients_by_name[name] for name in ingredient_names]
+    for ingredient in ingredients:
+        if ingredient.name in existing_ingredients:
+            log_lines.append(f'ℹ️ Ingredient already exists: {ingredient.name}')
         else:
-            print(f'ℹ️ Ingredient already exists: {ingredient.name}')
+            log_lines.append(f'✅ Created ingredient: {ingredient.name}')
     
-    print(f'\\n📊 Created {len(suppliers)} suppliers and {len(ingredients)} ingredients')
-    print('\\n💡 To add stock movements and test the analytics:')
-    print('   1. Go to the inventory dashboard')
-    print('   2. Add some stock movements (in/out/waste)')
-    print('   3. The analytics will show real data based on your movements')
+    log_lines.extend([
+        '',
+        f'📊 Created {len(suppliers)} suppliers and {len(ingredients)} ingredients',
+        '',
+        '💡 To add stock movements and test the analytics:',
+        '   1. Go to the inventory dashboard',
+        '   2. Add some stock movements (in/out/waste)',
+        '   3. The analytics will show real data based on your movements',
+    ])
+    print('\n'.join(log_lines))
     
     return suppliers, ingredients
 
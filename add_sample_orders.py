@@ -5,96 +5,82 @@ Run this script when you want to add actual orders for testing analytics
 """
 
 import os
-import sys
-import django
 from datetime import datetime, timedelta
 from decimal import Decimal
 import random
 
-# Add the project directory to Python path
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-# Setup Django
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sweetbite_backend.settings')
-django.setup()
+import bootstrap  # noqa: F401  Sets up Django
 
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
-from orders.models import Order, OrderItem, ShippingAddress
+from orders.models import Order, OrderItem, ShippingAddress, CustomerOrderStats
 from cakes.models import Cake
 from users.models import User
 
-def create_real_order(customer, cakes, order_date=None):
-    """Create a single real order"""
-    if not order_date:
-        order_date = timezone.now()
+TAX_RATE = Decimal('0.08')  # 8% tax
+DELIVERY_FEE = Decimal('5.00')
+FREE_DELIVERY_THRESHOLD = Decimal('50.00')
+ZERO = Decimal('0.00')
+
+# Fixed seed so repeated runs generate the same orders; override with SEED_RANDOM_SEED
+RANDOM_SEED = int(os.environ.get('SEED_RANDOM_SEED', 42))
+
+def next_order_numbers(count):
+    """Reserve `count` sequential order numbers, mirroring Order.save()"""
+    today = datetime.now()
+    last_order = Order.objects.filter(created_at__date=today.date()).order_by('-id').first()
+    last_number = int(last_order.order_number[-4:]) if last_order else 0
+    return [
+        f"SB{today.strftime('%Y%m%d')}{last_number + offset:04d}"
+        for offset in range(1, count + 1)
+    ]
+
+def build_order(rng, customer, shipping_address, cakes, order_date, num_items, quantities, delivery_hours):
+    """Build a single real order and its items without saving them
     
-    # Create shipping address for the customer
-    shipping_address, created = ShippingAddress.objects.get_or_create(
-        customer=customer,
-        defaults={
-            'first_name': customer.first_name or 'Customer',
-            'last_name': customer.last_name or 'Name',
-            'phone': '+1234567890',
-            'address_line1': '123 Main Street',
-            'city': 'Your City',
-            'state': 'Your State',
-            'postal_code': '12345',
-            'country': 'Your Country',
-            'is_default': True
-        }
-    )
+    The random draws (item count, per-item quantities, delivery delay) are
+    precomputed by the caller so the per-order path stays allocation-only.
+    """
+    # Add random cakes to the order
+    selected_cakes = rng.sample(cakes, min(num_items, len(cakes)))
+    
+    # Line totals stay in Decimal; float arrays would round money values
+    order_items = [
+        OrderItem(
+            cake=cake,
+            quantity=quantity,
+            unit_price=cake.price,
+            total_price=cake.price * quantity
+        )
+        for cake, quantity in zip(selected_cakes, quantities)
+    ]
+    order_subtotal = sum((item.total_price for item in order_items), ZERO)
+    
+    # Order totals
+    tax = order_subtotal * TAX_RATE
+    delivery_fee = DELIVERY_FEE if order_subtotal < FREE_DELIVERY_THRESHOLD else ZERO
+    total_amount = order_subtotal + tax + delivery_fee
     
-    # Create order
-    order = Order.objects.create(
+    order = Order(
         customer=customer,
         order_type='online',
         order_status='delivered',
         payment_status='paid',
         payment_method='card',
         shipping_address=shipping_address,
-        subtotal=Decimal('0.00'),
-        tax=Decimal('0.00'),
-        delivery_fee=Decimal('0.00'),
-        total_amount=Decimal('0.00'),
+        subtotal=order_subtotal,
+        tax=tax,
+        delivery_fee=delivery_fee,
+        total_amount=total_amount,
         created_at=order_date,
-        delivered_at=order_date + timedelta(hours=random.randint(1, 24))
+        delivered_at=order_date + timedelta(hours=delivery_hours)
     )
     
-    # Add random cakes to the order
-    num_items = random.randint(1, 3)
-    selected_cakes = random.sample(cakes, min(num_items, len(cakes)))
-    
-    order_subtotal = Decimal('0.00')
-    
-    for cake in selected_cakes:
-        quantity = random.randint(1, 2)
-        unit_price = cake.price
-        total_price = unit_price * quantity
-        
-        OrderItem.objects.create(
-            order=order,
-            cake=cake,
-            quantity=quantity,
-            unit_price=unit_price,
-            total_price=total_price
-        )
-        
-        order_subtotal += total_price
-    
-    # Update order totals
-    tax = order_subtotal * Decimal('0.08')  # 8% tax
-    delivery_fee = Decimal('5.00') if order_subtotal < Decimal('50.00') else Decimal('0.00')
-    total_amount = order_subtotal + tax + delivery_fee
-    
-    order.subtotal = order_subtotal
-    order.tax = tax
-    order.delivery_fee = delivery_fee
-    order.total_amount = total_amount
-    order.save()
-    
-    return order
+    return order, order_items
 
+@transaction.atomic
 def add_sample_orders():
     """Add some sample orders for testing analytics"""
     
@@ -119,8 +105,25 @@ def add_sample_orders():
     else:
         print(f"Using existing demo customer: {customer.username}")
     
+    # Create shipping address for the customer
+    shipping_address, _ = ShippingAddress.objects.get_or_create(
+        customer=customer,
+        defaults={
+            'first_name': customer.first_name or 'Customer',
+            'last_name': customer.last_name or 'Name',
+            'phone': '+1234567890',
+            'address_line1': '123 Main Street',
+            'city': 'Your City',
+            'state': 'Your State',
+            'postal_code': '12345',
+            'country': 'Your Country',
+            'is_default': True
+        }
+    )
+    
     # Get all cakes
-    cakes = list(Cake.objects.all())
+    # Only the price and the FK target are needed to build order items
+    cakes = list(Cake.objects.only('id', 'price'))
     if not cakes:
         print("❌ No cakes found! Please create cakes first.")
         return
@@ -128,24 +131,68 @@ def add_sample_orders():
     print(f"Found {len(cakes)} cakes")
     
     # Create sample orders for the last 30 days
-    orders_created = 0
+    num_orders = 20
+    max_items = 3
     
-    for i in range(20):  # Create 20 sample orders
-        # Random date within last 30 days
-        days_ago = random.randint(0, 30)
-        order_date = timezone.now() - timedelta(days=days_ago)
+    # Draw every random value in one pass up front
+    rng = random.Random(RANDOM_SEED)
+    now = timezone.now()
+    days_ago = rng.choices(range(0, 31), k=num_orders)  # Within last 30 days
+    item_counts = rng.choices(range(1, max_items + 1), k=num_orders)
+    quantities = rng.choices(range(1, 3), k=num_orders * max_items)
+    delivery_hours = rng.choices(range(1, 25), k=num_orders)
+    
+    pending_orders = []
+    
+    for i in range(num_orders):
+        order_date = now - timedelta(days=days_ago[i])
         
-        order = create_real_order(customer, cakes, order_date)
-        orders_created += 1
+        pending_orders.append(build_order(
+            rng,
+            customer,
+            shipping_address,
+            cakes,
+            order_date,
+            item_counts[i],
+            quantities[i * max_items:(i + 1) * max_items],
+            delivery_hours[i]
+        ))
+    
+    # bulk_create bypasses Order.save(), so assign order numbers up front
+    orders = [order for order, _ in pending_orders]
+    for order, order_number in zip(orders, next_order_numbers(len(orders))):
+        order.order_number = order_number
+    
+    orders = Order.objects.bulk_create(orders, batch_size=100)
+    
+    # Backends without RETURNING (MySQL) leave the PKs unset; read them back
+    if orders and orders[0].pk is None:
+        saved = Order.objects.in_bulk([o.order_number for o in orders], field_name='order_number')
+        orders = [saved[o.order_number] for o in orders]
+    
+    all_items = []
+    for order, (_, items) in zip(orders, pending_orders):
+        for item in items:
+            item.order = order
+        all_items.extend(items)
+    
+    OrderItem.objects.bulk_create(all_items, batch_size=100)
+    orders_created = len(orders)
+    
+    # bulk_create skips the post_save signal, so refresh the customer roll-ups explicitly
+    CustomerOrderStats.refresh({order.customer_id for order in orders})
     
     print(f"✅ Created {orders_created} sample orders")
     
     # Print summary
-    total_orders = Order.objects.count()
-    delivered_orders = Order.objects.filter(order_status='delivered').count()
-    total_revenue = Order.objects.filter(order_status='delivered').aggregate(
-        total=models.Sum('total_amount')
-    )['total'] or Decimal('0.00')
+    summary = Order.objects.aggregate(
+        total_orders=Count('id'),
+        delivered_orders=Count('id', filter=Q(order_status='delivered')),
+        total_revenue=Sum('total_amount', filter=Q(order_status='delivered'))
+    )
+    total_orders = summary['total_orders']
+    delivered_orders = summary['delivered_orders']
+    total_revenue = summary['total_revenue'] or ZERO
     
     print(f"\n📊 Analytics Summary:")
     print(f"Total Orders: {total_orders}")
@@ -156,5 +203,4 @@ def add_sample_orders():
     print("You can now view real analytics data in the Best-Selling Items & Profit Analyzer.")
 
 if __name__ == '__main__':
-    from django.db import models
     add_sample_orders()
@@ -0,0 +1,15 @@
+from rest_framework.permissions import BasePermission
+
+
+class IsAdminUserType(BasePermission):
+    """
+    Allows access only to admin users (user_type 'admin') and superusers
+    """
+    message = 'Access denied. Admin privileges required.'
+
+    def has_permission(self, request, view):
+        user = request.user
+        return bool(
+            user and user.is_authenticated and
+            (getattr(user, 'user_type', None) == 'admin' or user.is_superuser)
+        )
@@ -0,0 +1,169 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework import status
+from cakes.models import Cake, Category
+from orders.models import Order
+
+User = get_user_model()
+
+
+class AnalyticsTestDataMixin:
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123', user_type='admin'
+        )
+        self.client.force_authenticate(self.admin)
+        self.next_number = 1
+
+    def create_customer(self, username, order_count, **kwargs):
+        customer = User.objects.create_user(
+            username=username, email=f'{username}@example.com', password='testpass123', **kwargs
+        )
+        for _ in range(order_count):
+            Order.objects.create(
+                order_number=f'ORD{self.next_number:05d}',
+                customer=customer,
+                subtotal=Decimal('10.00'),
+                total_amount=Decimal('10.00')
+            )
+            self.next_number += 1
+        return customer
+
+
+class RepeatCustomerEmailTest(AnalyticsTestDataMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.create_customer('fourorders', 4)
+        self.create_customer('fiveorders', 5)
+        self.create_customer('tenorders', 10)
+        self.create_customer('twentyorders', 20)
+        self.create_customer('staffmember', 20, user_type='staff')
+
+    def test_gratitude_emails_go_to_customers_with_five_or_more_orders(self):
+        response = self.client.post(reverse('send_gratitude_emails'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['emails_sent'], 3)
+        self.assertEqual(
+            [(detail['email'], detail['orders'], detail['total_spent']) for detail in response.data['email_details']],
+            [('fiveorders@example.com', 5, 50.0), ('tenorders@example.com', 10, 100.0), ('twentyorders@example.com', 20, 200.0)]
+        )
+        self.assertEqual([message.to for message in mail.outbox], [
+            ['fiveorders@example.com'], ['tenorders@example.com'], ['twentyorders@example.com']
+        ])
+
+    def test_special_offers_go_to_customers_with_ten_or_more_orders(self):
+        response = self.client.post(reverse('create_special_offers'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # One offer per 10-order milestone
+        self.assertEqual(
+            [(offer['customer_email'], offer['milestone']) for offer in response.data['offer_details']],
+            [('tenorders@example.com', 10), ('twentyorders@example.com', 10), ('twentyorders@example.com', 20)]
+        )
+        self.assertEqual(len(mail.outbox), 3)
+
+
+class EmailConnectionTest(AnalyticsTestDataMixin, APITestCase):
+    def test_mail_server_failure_is_reported_per_recipient(self):
+        self.create_customer('fiveorders', 5)
+        self.create_customer('sixorders', 6)
+        with mock.patch('analytics.views.get_connection') as get_connection:
+            get_connection.return_value.open.side_effect = OSError('Connection refused')
+            response = self.client.post(reverse('send_gratitude_emails'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['emails_sent'], 0)
+        self.assertEqual(
+            [detail['status'] for detail in response.data['email_details']],
+            ['failed: Connection refused', 'failed: Connection refused']
+        )
+
+    def test_special_offers_mail_server_failure_does_not_fail_request(self):
+        self.create_customer('tenorders', 10)
+        with mock.patch('analytics.views.get_connection') as get_connection:
+            get_connection.return_value.open.side_effect = OSError('Connection refused')
+            response = self.client.post(reverse('create_special_offers'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['offers_created'], 1)
+
+    def test_no_connection_is_opened_without_recipients(self):
+        # A repeat customer without an email address, and nobody with 10+ orders
+        customer = self.create_customer('nineorders', 9)
+        customer.email = ''
+        customer.save()
+        with mock.patch('analytics.views.get_connection') as get_connection:
+            self.assertEqual(self.client.post(reverse('send_gratitude_emails')).data['emails_sent'], 0)
+            self.assertEqual(self.client.post(reverse('create_special_offers')).data['offers_created'], 0)
+        get_connection.assert_not_called()
+
+
+class CakeIdValidationTest(AnalyticsTestDataMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        category = Category.objects.create(name='Birthday')
+        self.cake = Cake.objects.create(
+            name='Chocolate Dream', description='A test cake', price=Decimal('25.00'),
+            category=category, image='cakes/test.jpg'
+        )
+
+    def test_profit_analysis_validates_cake_id(self):
+        url = reverse('profit_analysis')
+        self.assertEqual(self.client.get(url, {'cake_id': 'abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(url, {'cake_id': self.cake.id + 1}).status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(url, {'cake_id': self.cake.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['cake']['name'], 'Chocolate Dream')
+
+    def test_promote_cake_validates_cake_id(self):
+        url = reverse('promote_cake')
+        self.assertEqual(self.client.post(url, {'cake_id': 'abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(url, {'cake_id': self.cake.id + 1}).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ReturningCustomersTest(AnalyticsTestDataMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        # Loyalty figures are cached per day
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def add_order(self, customer, days_ago, order_status='delivered'):
+        order = Order.objects.create(
+            order_number=f'ORD{self.next_number:05d}',
+            customer=customer,
+            order_status=order_status,
+            subtotal=Decimal('10.00'),
+            total_amount=Decimal('10.00')
+        )
+        self.next_number += 1
+        Order.objects.filter(pk=order.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+
+    def test_returning_customers_ordered_before_and_within_last_thirty_days(self):
+        returning = self.create_customer('returning', 0)
+        self.add_order(returning, 60)
+        self.add_order(returning, 5)
+
+        only_recent = self.create_customer('onlyrecent', 0)
+        self.add_order(only_recent, 5)
+        self.add_order(only_recent, 2)
+
+        only_earlier = self.create_customer('onlyearlier', 0)
+        self.add_order(only_earlier, 90)
+        self.add_order(only_earlier, 60)
+
+        # Only delivered orders count, on either side of the window
+        undelivered = self.create_customer('undelivered', 0)
+        self.add_order(undelivered, 60)
+        self.add_order(undelivered, 5, order_status='pending')
+
+        response = self.client.get(reverse('customer_loyalty'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['customers']['returning_customers'], 1)
+        self.assertEqual(response.data['customers']['total_customers'], 4)
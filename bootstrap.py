@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+"""
+Shared Django setup for the standalone utility scripts
+Import this module before any model imports
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import django
+
+ROOT = Path(__file__).resolve().parent
+
+# Make the project importable when the scripts are run from another directory
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sweetbite_backend.settings')
+django.setup()
@@ -1,3 +1,6 @@
+from decimal import Decimal
+
+from django import forms
 from django.contrib import admin
 from .models import Category, Cake, CustomCake, CakeSize, CakeShape, Frosting, Topping
 
@@ -7,12 +10,36 @@ class CategoryAdmin(admin.ModelAdmin):
     list_filter = ('is_active', 'created_at')
     search_fields = ('name', 'description')
 
+class CakeAdminForm(forms.ModelForm):
+    # Cake.rating is stored in hundredths of a star; edit it in stars
+    rating = forms.DecimalField(
+        min_value=0, max_value=5, decimal_places=2, initial=0,
+        help_text='Average review rating in stars (0-5)'
+    )
+
+    class Meta:
+        model = Cake
+        fields = '__all__'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial['rating'] = Decimal(self.instance.rating).scaleb(-2)
+
+    def clean_rating(self):
+        return round(self.cleaned_data['rating'] * 100)
+
 @admin.register(Cake)
 class CakeAdmin(admin.ModelAdmin):
-    list_display = ('name', 'category', 'price', 'is_available', 'rating', 'created_at')
+    form = CakeAdminForm
+    list_display = ('name', 'category', 'price', 'is_available', 'rating_stars', 'created_at')
     list_filter = ('category', 'is_available', 'is_customizable', 'created_at')
     search_fields = ('name', 'description', 'ingredients')
 
+    @admin.display(description='Rating', ordering='rating')
+    def rating_stars(self, obj):
+        return Decimal(obj.rating).scaleb(-2)
+
 @admin.register(CustomCake)
 class CustomCakeAdmin(admin.ModelAdmin):
     list_display = ('base_cake', 'size', 'shape', 'total_price', 'created_at')
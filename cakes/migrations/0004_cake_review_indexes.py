@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-15 22:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cakes', '0003_alter_review_unique_together'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='cake',
+            index=models.Index(fields=['category', 'is_available'], name='cakes_category_avail_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='cake',
+            index=models.Index(fields=['is_available', '-created_at'], name='cakes_avail_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['cake', 'rating'], name='cake_reviews_cake_rating_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.7 on 2026-10-15 23:05
+
+from decimal import Decimal
+
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import migrations, models
+from django.db.models import F
+
+
+def rating_to_hundredths(apps, schema_editor):
+    Cake = apps.get_model('cakes', 'Cake')
+    Cake.objects.update(rating=F('rating') * 100)
+
+
+def rating_from_hundredths(apps, schema_editor):
+    Cake = apps.get_model('cakes', 'Cake')
+    for cake in Cake.objects.exclude(rating=0).only('rating'):
+        Cake.objects.filter(pk=cake.pk).update(rating=Decimal(int(cake.rating)) / 100)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cakes', '0004_cake_review_indexes'),
+    ]
+
+    operations = [
+        # Widen the decimal first so the scaled values fit before the integer cast
+        migrations.AlterField(
+            model_name='cake',
+            name='rating',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=5),
+        ),
+        migrations.RunPython(rating_to_hundredths, rating_from_hundredths),
+        migrations.AlterField(
+            model_name='cake',
+            name='rating',
+            field=models.PositiveSmallIntegerField(default=0, validators=[MinValueValidator(0), MaxValueValidator(500)]),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 22:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cakes', '0005_cake_rating_hundredths'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['cake', '-created_at'], name='cake_reviews_cake_created_idx'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.conf import settings
 
@@ -71,11 +71,10 @@ class Cake(models.Model):
     image = models.ImageField(upload_to='cakes/')
     is_available = models.BooleanField(default=True)
     is_customizable = models.BooleanField(default=True)
-    rating = models.DecimalField(
-        max_digits=3, 
-        decimal_places=2, 
+    # Average review rating in hundredths of a star (0-500), i.e. 4.25 stars is stored as 425
+    rating = models.PositiveSmallIntegerField(
         default=0,
-        validators=[MinValueValidator(0), MaxValueValidator(5)]
+        validators=[MinValueValidator(0), MaxValueValidator(500)]
     )
     review_count = models.IntegerField(default=0)
     ingredients = models.JSONField(default=list)
@@ -86,6 +85,11 @@ class Cake(models.Model):
 
     class Meta:
         db_table = 'cakes'
+        indexes = [
+            # Storefront lists filter on availability, by category or newest first
+            models.Index(fields=['category', 'is_available'], name='cakes_category_avail_idx'),
+            models.Index(fields=['is_available', '-created_at'], name='cakes_avail_created_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -94,38 +98,24 @@ class Cake(models.Model):
         """Calculate price based on customizations"""
         price = self.price
         
-        # Add size modifier
-        if customizations.get('size'):
-            try:
-                size = CakeSize.objects.get(id=customizations['size'])
-                price += size.price_modifier
-            except CakeSize.DoesNotExist:
-                pass
+        # Add size, shape and frosting modifiers (missing options add nothing)
+        for model, key in ((CakeSize, 'size'), (CakeShape, 'shape'), (Frosting, 'frosting')):
+            if customizations.get(key):
+                modifier = model.objects.filter(
+                    id=customizations[key]
+                ).values_list('price_modifier', flat=True).first()
+                if modifier is not None:
+                    price += modifier
         
-        # Add shape modifier
-        if customizations.get('shape'):
-            try:
-                shape = CakeShape.objects.get(id=customizations['shape'])
-                price += shape.price_modifier
-            except CakeShape.DoesNotExist:
-                pass
-        
-        # Add frosting modifier
-        if customizations.get('frosting'):
-            try:
-                frosting = Frosting.objects.get(id=customizations['frosting'])
-                price += frosting.price_modifier
-            except Frosting.DoesNotExist:
-                pass
-        
-        # Add toppings
+        # Add toppings, fetched in one query; a topping listed twice is charged twice
         if customizations.get('toppings'):
+            topping_modifiers = dict(
+                Topping.objects.filter(
+                    id__in=customizations['toppings']
+                ).values_list('id', 'price_modifier')
+            )
             for topping_id in customizations['toppings']:
-                try:
-                    topping = Topping.objects.get(id=topping_id)
-                    price += topping.price_modifier
-                except Topping.DoesNotExist:
-                    pass
+                price += topping_modifiers.get(int(topping_id), 0)
         
         return price
 
@@ -148,15 +138,21 @@ class CustomCake(models.Model):
         return f"Custom {self.base_cake.name}"
 
     def save(self, *args, **kwargs):
-        # Calculate total price before saving
+        # Calculate total price before saving. Toppings can only be read once the custom
+        # cake has a primary key; cakes.signals updates the price when they are set later.
+        topping_ids = list(self.toppings.values_list('id', flat=True)) if self.pk else []
+        self.total_price = self.calculate_total_price(topping_ids)
+        super().save(*args, **kwargs)
+
+    def calculate_total_price(self, topping_ids):
+        """Calculate the total price for this custom cake with the given toppings"""
         customizations = {
-            'size': self.size.id if self.size else None,
-            'shape': self.shape.id if self.shape else None,
-            'frosting': self.frosting.id if self.frosting else None,
-            'toppings': list(self.toppings.values_list('id', flat=True))
+            'size': self.size_id,
+            'shape': self.shape_id,
+            'frosting': self.frosting_id,
+            'toppings': topping_ids
         }
-        self.total_price = self.base_cake.calculate_customized_price(customizations)
-        super().save(*args, **kwargs)
+        return self.base_cake.calculate_customized_price(customizations)
 
 class Review(models.Model):
     cake = models.ForeignKey(Cake, on_delete=models.CASCADE, related_name='reviews')
@@ -171,28 +167,38 @@ class Review(models.Model):
     class Meta:
         db_table = 'cake_reviews'
         # unique_together = ['cake', 'user']  # Removed to allow multiple reviews per user per cake
+        indexes = [
+            # Covers the per-cake rating aggregate in update_cake_rating
+            models.Index(fields=['cake', 'rating'], name='cake_reviews_cake_rating_idx'),
+            # Per-cake review lists sorted newest first (cake_reviews, cake detail)
+            models.Index(fields=['cake', '-created_at'], name='cake_reviews_cake_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.cake.name} ({self.rating}/5)"
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
-        # Update cake rating and review count
-        self.update_cake_rating()
+        # Update cake rating and review count once the review write has committed
+        transaction.on_commit(self.update_cake_rating)
 
     def delete(self, *args, **kwargs):
         super().delete(*args, **kwargs)
-        # Update cake rating and review count
-        self.update_cake_rating()
+        # Update cake rating and review count once the review delete has committed
+        transaction.on_commit(self.update_cake_rating)
 
     def update_cake_rating(self):
         """Update the cake's average rating and review count"""
-        reviews = Review.objects.filter(cake=self.cake)
-        if reviews.exists():
-            avg_rating = reviews.aggregate(models.Avg('rating'))['rating__avg']
-            self.cake.rating = round(avg_rating, 2)
-            self.cake.review_count = reviews.count()
-        else:
-            self.cake.rating = 0
-            self.cake.review_count = 0
-        self.cake.save(update_fields=['rating', 'review_count'])
+        stats = Review.objects.filter(cake_id=self.cake_id).aggregate(
+            avg_rating=models.Avg('rating'),
+            review_count=models.Count('id')
+        )
+        Cake.objects.filter(pk=self.cake_id).update(
+            rating=round((stats['avg_rating'] or 0) * 100),
+            review_count=stats['review_count']
+        )
+        # update() sends no Cake post_save, and the Review signals fired before this ran,
+        # so drop the cached list pages and reviews again now that the new rating is stored
+        from cakes.signals import clear_cake_list_cache, clear_cake_reviews_cache
+        clear_cake_list_cache(sender=Cake)
+        clear_cake_reviews_cache(sender=Review, instance=self)
@@ -1,6 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework import serializers
 from .models import Cake, Category, CustomCake, Review, CakeSize, CakeShape, Frosting, Topping
 
+# Active sizes/shapes/frostings/toppings rarely change; cakes.signals clears this key when they do
+CUSTOMIZATION_OPTIONS_CACHE_KEY = 'cake:customization_options'
+CUSTOMIZATION_OPTIONS_CACHE_TIMEOUT = 3600  # seconds
+
+# Serialized reviews per cake; cakes.signals clears a cake's key when its reviews or availability change
+CAKE_REVIEWS_CACHE_KEY = 'cake:{cake_id}:reviews'
+CAKE_REVIEWS_CACHE_TIMEOUT = 300  # seconds
+
+# Public cake/category list responses are cached per URL under a version token;
+# cakes.signals replaces the token when cakes, categories or reviews change
+CAKE_LIST_CACHE_VERSION_KEY = 'cakes:available:version'
+CATEGORY_LIST_CACHE_VERSION_KEY = 'categories:active:version'
+LIST_CACHE_TIMEOUT = 600  # seconds
+
+# Customized price previews are memoized per (cake, customizations) under a version token;
+# cakes.signals replaces the token when cakes or customization options change
+CUSTOMIZED_PRICE_CACHE_VERSION_KEY = 'cake:customized_price:version'
+CUSTOMIZED_PRICE_CACHE_TIMEOUT = 3600  # seconds
+
+# Default images for cakes without an upload, picked by the first keyword found in the cake name
+DEFAULT_CAKE_IMAGES = (
+    ('chocolate', 'https://images.unsplash.com/photo-1578985545062-69928b1d9587?w=400&h=400&fit=crop'),
+    ('vanilla', 'https://images.unsplash.com/photo-1565958011703-44f9829ba187?w=400&h=400&fit=crop'),
+    ('strawberry', 'https://images.unsplash.com/photo-1464349095431-e9a21285b5f3?w=400&h=400&fit=crop'),
+)
+FALLBACK_CAKE_IMAGE = 'https://images.unsplash.com/photo-1578985545062-69928b1d9587?w=400&h=400&fit=crop'
+
+def cake_image_url(cake):
+    """Uploaded image URL, or a default image based on the cake name"""
+    if cake.image:
+        return cake.image.url
+    name = cake.name.lower()
+    for keyword, url in DEFAULT_CAKE_IMAGES:
+        if keyword in name:
+            return url
+    return FALLBACK_CAKE_IMAGE
+
+def active_option_rows(model, *fields):
+    """
+    Active customization options as plain dicts, matching the option serializers' output
+    without running DRF field machinery per row
+    """
+    rows = list(model.objects.filter(is_active=True).values(*fields))
+    for row in rows:
+        # DRF renders DecimalField as a string
+        row['price_modifier'] = str(row['price_modifier'])
+    return rows
+
 class CategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = Category
@@ -11,40 +61,28 @@ class CategoryWriteSerializer(serializers.ModelSerializer):
         model = Category
         fields = ['id', 'name', 'description', 'icon', 'is_active']
 
-class CakeSerializer(serializers.ModelSerializer):
+class CakeRatingMixin(serializers.Serializer):
+    """
+    Cake.rating in stars, rounded to one decimal. The model stores hundredths of a star,
+    so every cake serializer that outputs the rating must go through this field.
+    """
+    rating = serializers.SerializerMethodField()
+    
+    def get_rating(self, obj):
+        # rating and review_count are kept up to date by Review.update_cake_rating,
+        # so no per-cake review queries are needed here
+        return round(obj.rating / 100, 1) if obj.rating else 0
+
+class CakeSerializer(CakeRatingMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     image = serializers.SerializerMethodField()
-    rating = serializers.SerializerMethodField()
-    review_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Cake
         fields = '__all__'
     
     def get_image(self, obj):
-        if obj.image and hasattr(obj.image, 'url') and obj.image.url:
-            return obj.image.url
-        # Return default image URL if no image is uploaded
-        # Use different default images based on cake name
-        if 'chocolate' in obj.name.lower():
-            return 'https://images.unsplash.com/photo-1578985545062-69928b1d9587?w=400&h=400&fit=crop'
-        elif 'vanilla' in obj.name.lower():
-            return 'https://images.unsplash.com/photo-1565958011703-44f9829ba187?w=400&h=400&fit=crop'
-        elif 'strawberry' in obj.name.lower():
-            return 'https://images.unsplash.com/photo-1464349095431-e9a21285b5f3?w=400&h=400&fit=crop'
-        else:
-            return 'https://images.unsplash.com/photo-1578985545062-69928b1d9587?w=400&h=400&fit=crop'
-    
-    def get_rating(self, obj):
-        from django.db.models import Avg
-        reviews = obj.reviews.all()
-        if reviews.exists():
-            avg_rating = reviews.aggregate(avg_rating=Avg('rating'))['avg_rating']
-            return round(avg_rating, 1) if avg_rating else 0
-        return 0
-    
-    def get_review_count(self, obj):
-        return obj.reviews.count()
+        return cake_image_url(obj)
 
 class CakeWriteSerializer(serializers.ModelSerializer):
     category = serializers.PrimaryKeyRelatedField(queryset=Category.objects.all())
@@ -90,7 +128,29 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'rating', 'comment', 'created_at', 'updated_at']
         read_only_fields = ['user', 'created_at', 'updated_at']
 
-class CakeDetailSerializer(serializers.ModelSerializer):
+def review_rows(queryset):
+    """
+    Reviews as plain dicts matching ReviewSerializer's output, built from values() rows
+    so no Review/User instances or per-row serializers are created
+    """
+    user_type_labels = dict(get_user_model()._meta.get_field('user_type').flatchoices)
+    datetime_field = serializers.DateTimeField()
+    return [
+        {
+            'id': row['id'],
+            # Same text as str(user), which ReviewSerializer's StringRelatedField renders
+            'user': f"{row['user__username']} ({user_type_labels.get(row['user__user_type'], row['user__user_type'])})",
+            'rating': row['rating'],
+            'comment': row['comment'],
+            'created_at': datetime_field.to_representation(row['created_at']),
+            'updated_at': datetime_field.to_representation(row['updated_at']),
+        }
+        for row in queryset.values(
+            'id', 'user__username', 'user__user_type', 'rating', 'comment', 'created_at', 'updated_at'
+        )
+    ]
+
+class CakeDetailSerializer(CakeRatingMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     reviews = ReviewSerializer(many=True, read_only=True)
     customization_options = serializers.SerializerMethodField()
@@ -101,23 +161,16 @@ class CakeDetailSerializer(serializers.ModelSerializer):
         fields = '__all__'
     
     def get_image(self, obj):
-        if obj.image and hasattr(obj.image, 'url') and obj.image.url:
-            return obj.image.url
-        # Return default image URL if no image is uploaded
-        # Use different default images based on cake name
-        if 'chocolate' in obj.name.lower():
-            return 'https://images.unsplash.com/photo-1578985545062-69928b1d9587?w=400&h=400&fit=crop'
-        elif 'vanilla' in obj.name.lower():
-            return 'https://images.unsplash.com/photo-1565958011703-44f9829ba187?w=400&h=400&fit=crop'
-        elif 'strawberry' in obj.name.lower():
-            return 'https://images.unsplash.com/photo-1464349095431-e9a21285b5f3?w=400&h=400&fit=crop'
-        else:
-            return 'https://images.unsplash.com/photo-1578985545062-69928b1d9587?w=400&h=400&fit=crop'
+        return cake_image_url(obj)
     
     def get_customization_options(self, obj):
-        return {
-            'sizes': CakeSizeSerializer(CakeSize.objects.filter(is_active=True), many=True).data,
-            'shapes': CakeShapeSerializer(CakeShape.objects.filter(is_active=True), many=True).data,
-            'frostings': FrostingSerializer(Frosting.objects.filter(is_active=True), many=True).data,
-            'toppings': ToppingSerializer(Topping.objects.filter(is_active=True), many=True).data,
-        }
+        return cache.get_or_set(
+            CUSTOMIZATION_OPTIONS_CACHE_KEY,
+            lambda: {
+                'sizes': active_option_rows(CakeSize, 'id', 'name', 'servings', 'price_modifier', 'is_active'),
+                'shapes': active_option_rows(CakeShape, 'id', 'name', 'price_modifier', 'is_active'),
+                'frostings': active_option_rows(Frosting, 'id', 'name', 'price_modifier', 'color', 'is_active'),
+                'toppings': active_option_rows(Topping, 'id', 'name', 'price_modifier', 'is_active'),
+            },
+            CUSTOMIZATION_OPTIONS_CACHE_TIMEOUT
+        )
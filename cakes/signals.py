@@ -0,0 +1,87 @@
+"""
+Signals for keeping custom cake prices and cached customization options, reviews, list responses and price previews up to date
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+
+from cakes.models import Cake, Category, CustomCake, CakeSize, CakeShape, Frosting, Topping, Review
+from cakes.serializers import (
+    CUSTOMIZATION_OPTIONS_CACHE_KEY, CAKE_REVIEWS_CACHE_KEY,
+    CAKE_LIST_CACHE_VERSION_KEY, CATEGORY_LIST_CACHE_VERSION_KEY, CUSTOMIZED_PRICE_CACHE_VERSION_KEY
+)
+
+
+@receiver(m2m_changed, sender=CustomCake.toppings.through)
+def update_custom_cake_price_on_toppings_change(sender, instance, action, reverse, **kwargs):
+    """
+    Recalculate a custom cake's total price after its toppings are changed.
+    Uses update() so the full save path is not run again.
+    """
+    if reverse or action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    
+    topping_ids = list(instance.toppings.values_list('id', flat=True))
+    instance.total_price = instance.calculate_total_price(topping_ids)
+    CustomCake.objects.filter(pk=instance.pk).update(total_price=instance.total_price)
+
+
+@receiver([post_save, post_delete], sender=CakeSize)
+@receiver([post_save, post_delete], sender=CakeShape)
+@receiver([post_save, post_delete], sender=Frosting)
+@receiver([post_save, post_delete], sender=Topping)
+def clear_customization_options_cache(sender, **kwargs):
+    """
+    Drop the cached customization options whenever a size, shape, frosting or topping changes
+    """
+    cache.delete(CUSTOMIZATION_OPTIONS_CACHE_KEY)
+
+
+@receiver([post_save, post_delete], sender=Review)
+def clear_cake_reviews_cache(sender, instance, **kwargs):
+    """
+    Drop a cake's cached reviews whenever one of its reviews changes
+    """
+    cache.delete(CAKE_REVIEWS_CACHE_KEY.format(cake_id=instance.cake_id))
+
+
+@receiver([post_save, post_delete], sender=Cake)
+def clear_cake_reviews_cache_for_cake(sender, instance, **kwargs):
+    """
+    Drop a cake's cached reviews when the cake changes, e.g. it is made unavailable
+    """
+    cache.delete(CAKE_REVIEWS_CACHE_KEY.format(cake_id=instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Cake)
+@receiver([post_save, post_delete], sender=Review)
+def clear_cake_list_cache(sender, **kwargs):
+    """
+    Invalidate every cached cake list page; reviews change the ratings shown in the list
+    """
+    cache.set(CAKE_LIST_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def clear_category_list_cache(sender, **kwargs):
+    """
+    Invalidate every cached category and cake list page; cakes embed their category
+    """
+    cache.set_many({
+        CATEGORY_LIST_CACHE_VERSION_KEY: uuid.uuid4().hex,
+        CAKE_LIST_CACHE_VERSION_KEY: uuid.uuid4().hex,
+    }, None)
+
+
+@receiver([post_save, post_delete], sender=Cake)
+@receiver([post_save, post_delete], sender=CakeSize)
+@receiver([post_save, post_delete], sender=CakeShape)
+@receiver([post_save, post_delete], sender=Frosting)
+@receiver([post_save, post_delete], sender=Topping)
+def clear_customized_price_cache(sender, **kwargs):
+    """
+    Invalidate every memoized price preview when a base price, availability or option price changes
+    """
+    cache.set(CUSTOMIZED_PRICE_CACHE_VERSION_KEY, uuid.uuid4().hex, None)
@@ -0,0 +1,196 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+from .admin import CakeAdminForm
+from .models import Cake, Category, Review
+
+User = get_user_model()
+
+
+class CakeTestDataMixin:
+    def setUp(self):
+        # The cache outlives each test's transaction, so start every test from an empty one
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.category = Category.objects.create(name='Birthday')
+        self.cake = self.create_cake('Chocolate Dream')
+
+    def create_cake(self, name, **kwargs):
+        return Cake.objects.create(
+            name=name,
+            description='A test cake',
+            price=Decimal('25.00'),
+            category=self.category,
+            image='cakes/test.jpg',
+            **kwargs
+        )
+
+
+class CakeReviewsCacheTest(CakeTestDataMixin, APITestCase):
+    def test_new_review_is_listed(self):
+        url = reverse('cakes:cake_reviews', args=[self.cake.id])
+        self.assertEqual(self.client.get(url).data, [])
+
+        Review.objects.create(cake=self.cake, user=self.user, rating=5, comment='Lovely')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([review['comment'] for review in response.data], ['Lovely'])
+
+    def test_deleted_review_is_dropped(self):
+        review = Review.objects.create(cake=self.cake, user=self.user, rating=5, comment='Lovely')
+        url = reverse('cakes:cake_reviews', args=[self.cake.id])
+        self.assertEqual(len(self.client.get(url).data), 1)
+
+        review.delete()
+        self.assertEqual(self.client.get(url).data, [])
+
+    def test_unavailable_cake_reviews_are_not_found(self):
+        url = reverse('cakes:cake_reviews', args=[self.cake.id])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.cake.is_available = False
+        self.cake.save()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+
+class CakeListCacheTest(CakeTestDataMixin, APITestCase):
+    def cake_names(self):
+        response = self.client.get(reverse('cakes:cake_list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [cake['name'] for cake in response.data['results']]
+
+    def test_new_cake_is_listed(self):
+        self.assertEqual(self.cake_names(), ['Chocolate Dream'])
+
+        self.create_cake('Vanilla Cloud')
+        self.assertEqual(self.cake_names(), ['Vanilla Cloud', 'Chocolate Dream'])
+
+    def test_unavailable_cake_is_dropped(self):
+        self.assertEqual(self.cake_names(), ['Chocolate Dream'])
+
+        self.cake.is_available = False
+        self.cake.save()
+        self.assertEqual(self.cake_names(), [])
+
+    def test_new_review_refreshes_cached_list_rating(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(cake=self.cake, user=self.user, rating=5, comment='Lovely')
+            # A list request between the review write and the rating recompute caches the old rating
+            self.assertEqual(self.client.get(reverse('cakes:cake_list')).data['results'][0]['rating'], 0)
+        self.assertEqual(self.client.get(reverse('cakes:cake_list')).data['results'][0]['rating'], 5.0)
+
+    def test_category_change_refreshes_cake_and_category_lists(self):
+        self.assertEqual(self.client.get(reverse('cakes:cake_list')).data['results'][0]['category']['name'], 'Birthday')
+        self.assertEqual(len(self.client.get(reverse('cakes:category_list')).data['results']), 1)
+
+        self.category.name = 'Celebration'
+        self.category.save()
+        self.assertEqual(self.client.get(reverse('cakes:cake_list')).data['results'][0]['category']['name'], 'Celebration')
+
+        self.category.is_active = False
+        self.category.save()
+        self.assertEqual(self.client.get(reverse('cakes:category_list')).data['results'], [])
+
+
+class CakeRatingTest(CakeTestDataMixin, APITestCase):
+    def api_ratings(self):
+        listed = self.client.get(reverse('cakes:cake_list')).data['results'][0]['rating']
+        detail = self.client.get(reverse('cakes:cake_detail', args=[self.cake.id])).data['rating']
+        return listed, detail
+
+    def add_review(self, rating):
+        # Review.save recomputes the cake rating once the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            Review.objects.create(cake=self.cake, user=self.user, rating=rating, comment='Test review')
+
+    def test_review_recompute_is_shown_in_stars_by_list_and_detail(self):
+        self.assertEqual(self.api_ratings(), (0, 0))
+
+        self.add_review(4)
+        self.add_review(5)
+        self.cake.refresh_from_db()
+        self.assertEqual(self.cake.rating, 450)
+        self.assertEqual(self.cake.review_count, 2)
+        self.assertEqual(self.api_ratings(), (4.5, 4.5))
+
+        self.add_review(3)
+        self.assertEqual(self.api_ratings(), (4.0, 4.0))
+
+    def test_stored_hundredths_are_rounded_to_one_decimal(self):
+        Cake.objects.filter(pk=self.cake.pk).update(rating=467)
+        cache.clear()
+        self.assertEqual(self.api_ratings(), (4.7, 4.7))
+
+
+class CakeAdminFormTest(CakeTestDataMixin, TestCase):
+    def form_data(self, rating):
+        return {
+            'name': self.cake.name,
+            'description': self.cake.description,
+            'price': '25.00',
+            'category': self.category.id,
+            'is_available': True,
+            'is_customizable': True,
+            'rating': rating,
+            'review_count': 0,
+            'ingredients': '["flour"]',
+            'allergens': '["gluten"]',
+            'preparation_time': '2-3 hours',
+        }
+
+    def test_rating_is_edited_in_stars(self):
+        Cake.objects.filter(pk=self.cake.pk).update(rating=425)
+        self.cake.refresh_from_db()
+        self.assertEqual(CakeAdminForm(instance=self.cake).initial['rating'], Decimal('4.25'))
+
+        form = CakeAdminForm(data=self.form_data('3.5'), instance=self.cake)
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.cake.refresh_from_db()
+        self.assertEqual(self.cake.rating, 350)
+
+    def test_rating_above_five_stars_is_rejected(self):
+        form = CakeAdminForm(data=self.form_data('425'), instance=self.cake)
+        self.assertFalse(form.is_valid())
+        self.assertIn('rating', form.errors)
+
+
+class CakeRatingMigrationTest(TransactionTestCase):
+    before = [('cakes', '0004_cake_review_indexes')]
+    after = [('cakes', '0005_cake_rating_hundredths')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        # Leave the schema fully migrated for the tests that follow
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_rating_round_trips_through_hundredths(self):
+        apps = self.migrate(self.before)
+        category = apps.get_model('cakes', 'Category').objects.create(name='Birthday')
+        cake = apps.get_model('cakes', 'Cake').objects.create(
+            name='Chocolate Dream', description='A test cake', price=Decimal('25.00'),
+            category=category, image='cakes/test.jpg', rating=Decimal('4.25')
+        )
+
+        apps = self.migrate(self.after)
+        self.assertEqual(apps.get_model('cakes', 'Cake').objects.get(pk=cake.pk).rating, 425)
+
+        apps = self.migrate(self.before)
+        self.assertEqual(apps.get_model('cakes', 'Cake').objects.get(pk=cake.pk).rating, Decimal('4.25'))
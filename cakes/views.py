@@ -1,26 +1,85 @@
+import logging
+
 from rest_framework import generics, status, permissions
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import api_view, permission_classes
 from django.shortcuts import get_object_or_404
+from django.http import Http404
+from django.core.cache import cache
+import hashlib
+import json
+import uuid
+from django.db import transaction
+from django.db.models import Prefetch
 from .models import Cake, Category, CustomCake, Review
 from .serializers import (
     CakeSerializer, CategorySerializer, CustomCakeSerializer,
     CakeDetailSerializer, ReviewSerializer, CakeWriteSerializer,
-    CategoryWriteSerializer
+    CategoryWriteSerializer, review_rows, CAKE_REVIEWS_CACHE_KEY, CAKE_REVIEWS_CACHE_TIMEOUT,
+    CAKE_LIST_CACHE_VERSION_KEY, CATEGORY_LIST_CACHE_VERSION_KEY, LIST_CACHE_TIMEOUT,
+    CUSTOMIZED_PRICE_CACHE_VERSION_KEY, CUSTOMIZED_PRICE_CACHE_TIMEOUT
 )
 
-class CakeListAPIView(generics.ListAPIView):
-    queryset = Cake.objects.filter(is_available=True)
+logger = logging.getLogger(__name__)
+
+class CachedListMixin:
+    """
+    Serve list responses from the cache, keyed by the request URL (page, filters)
+    and the current version token stored under cache_version_key
+    """
+    cache_version_key = None
+
+    def list(self, request, *args, **kwargs):
+        version = cache.get_or_set(self.cache_version_key, lambda: uuid.uuid4().hex, None)
+        url_hash = hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+        cache_key = f'{self.cache_version_key}:{version}:{url_hash}'
+        data = cache.get(cache_key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(cache_key, data, LIST_CACHE_TIMEOUT)
+        return Response(data)
+
+class EagerLoadingMixin:
+    """
+    Apply select_related / prefetch_related lookups declared on the view to its queryset,
+    so serializers that reach into relations don't trigger per-row queries
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.select_related_fields:
+            queryset = queryset.select_related(*self.select_related_fields)
+        if self.prefetch_related_fields:
+            queryset = queryset.prefetch_related(*self.prefetch_related_fields)
+        return queryset
+
+class CakeListAPIView(CachedListMixin, EagerLoadingMixin, generics.ListAPIView):
+    cache_version_key = CAKE_LIST_CACHE_VERSION_KEY
+    # Stable newest-first order so pages don't shift; served by cakes_avail_created_idx
+    queryset = Cake.objects.filter(is_available=True).order_by('-created_at', '-id')
+    select_related_fields = ('category',)
     serializer_class = CakeSerializer
     permission_classes = [AllowAny]
 
-class CakeDetailAPIView(generics.RetrieveAPIView):
+class CakeDetailAPIView(EagerLoadingMixin, generics.RetrieveAPIView):
     queryset = Cake.objects.filter(is_available=True)
+    select_related_fields = ('category',)
+    prefetch_related_fields = (
+        # ReviewSerializer renders str(user), which needs username and user_type;
+        # newest first, matching the cake_reviews endpoint
+        Prefetch('reviews', queryset=Review.objects.select_related('user').only(
+            'id', 'cake_id', 'rating', 'comment', 'created_at', 'updated_at',
+            'user__username', 'user__user_type'
+        ).order_by('-created_at')),
+    )
     serializer_class = CakeDetailSerializer
     permission_classes = [AllowAny]
 
-class CategoryListAPIView(generics.ListAPIView):
+class CategoryListAPIView(CachedListMixin, generics.ListAPIView):
+    cache_version_key = CATEGORY_LIST_CACHE_VERSION_KEY
     queryset = Category.objects.filter(is_active=True)
     serializer_class = CategorySerializer
     permission_classes = [AllowAny]
@@ -30,45 +89,68 @@ class CustomCakeCreateAPIView(generics.CreateAPIView):
     serializer_class = CustomCakeSerializer
     permission_classes = [AllowAny]
 
+    def perform_create(self, serializer):
+        # The insert, the toppings rows and the repriced total (cakes.signals) commit together
+        with transaction.atomic():
+            serializer.save()
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def cake_reviews(request, cake_id):
     """Get all reviews for a specific cake"""
-    cake = get_object_or_404(Cake, id=cake_id, is_available=True)
-    reviews = Review.objects.filter(cake=cake).order_by('-created_at')
-    serializer = ReviewSerializer(reviews, many=True)
-    return Response(serializer.data)
+    cache_key = CAKE_REVIEWS_CACHE_KEY.format(cake_id=cake_id)
+    data = cache.get(cache_key)
+    if data is None:
+        if not Cake.objects.filter(id=cake_id, is_available=True).exists():
+            raise Http404
+        data = review_rows(Review.objects.filter(cake_id=cake_id).order_by('-created_at'))
+        cache.set(cache_key, data, CAKE_REVIEWS_CACHE_TIMEOUT)
+    return Response(data)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_review(request, cake_id):
     """Create a new review for a cake"""
-    print(f"Creating review for cake {cake_id} by user {request.user}")
-    print(f"Request data: {request.data}")
+    logger.debug("Creating review for cake %s by user %s", cake_id, request.user)
     
-    cake = get_object_or_404(Cake, id=cake_id, is_available=True)
+    # Only existence is needed; the review is saved against the cake id
+    if not Cake.objects.filter(id=cake_id, is_available=True).exists():
+        raise Http404
     
     # Allow multiple reviews from same user (validation removed as requested)
     
     serializer = ReviewSerializer(data=request.data)
     if serializer.is_valid():
-        print(f"Serializer is valid, saving review")
-        serializer.save(cake=cake, user=request.user)
+        serializer.save(cake_id=cake_id, user=request.user)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     else:
-        print(f"Serializer errors: {serializer.errors}")
+        logger.debug("Review for cake %s rejected: %s", cake_id, serializer.errors)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def calculate_customized_price(request, cake_id):
     """Calculate the price of a cake with customizations"""
-    cake = get_object_or_404(Cake, id=cake_id, is_available=True)
     customizations = request.data.get('customizations', {})
     
+    # Price previews are requested repeatedly as options are toggled; memoize identical inputs
+    version = cache.get_or_set(CUSTOMIZED_PRICE_CACHE_VERSION_KEY, lambda: uuid.uuid4().hex, None)
+    inputs_hash = hashlib.blake2b(
+        json.dumps({'cake': cake_id, 'customizations': customizations}, sort_keys=True).encode(),
+        digest_size=16
+    ).hexdigest()
+    cache_key = f'{CUSTOMIZED_PRICE_CACHE_VERSION_KEY}:{version}:{inputs_hash}'
+    price = cache.get(cache_key)
+    if price is not None:
+        return Response({'price': price})
+    
+    # calculate_customized_price only reads the base price
+    cake = get_object_or_404(Cake.objects.only('id', 'price'), id=cake_id, is_available=True)
+    
     try:
-        price = cake.calculate_customized_price(customizations)
-        return Response({'price': float(price)})
+        price = float(cake.calculate_customized_price(customizations))
+        cache.set(cache_key, price, CUSTOMIZED_PRICE_CACHE_TIMEOUT)
+        return Response({'price': price})
     except Exception as e:
         return Response(
             {'error': str(e)}, 
@@ -76,8 +158,9 @@ def calculate_customized_price(request, cake_id):
         )
 
 
-class AdminCakeListCreateAPIView(generics.ListCreateAPIView):
-    queryset = Cake.objects.all().order_by('-created_at')
+class AdminCakeListCreateAPIView(EagerLoadingMixin, generics.ListCreateAPIView):
+    queryset = Cake.objects.order_by('-created_at')
+    select_related_fields = ('category',)
     permission_classes = [permissions.IsAdminUser]
 
     def get_serializer_class(self):
@@ -86,8 +169,9 @@ class AdminCakeListCreateAPIView(generics.ListCreateAPIView):
         return CakeSerializer
 
 
-class AdminCakeRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class AdminCakeRetrieveUpdateDestroyAPIView(EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Cake.objects.all()
+    select_related_fields = ('category',)
     permission_classes = [permissions.IsAdminUser]
 
     def get_serializer_class(self):
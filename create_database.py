@@ -3,9 +3,15 @@
 Simple MySQL database creation script for SweetBite
 """
 
+import os
+import pprint
+import tempfile
 import pymysql
 import getpass
 
+# Written by update_django_settings and loaded by settings.py in place of its default DATABASES
+DB_CONFIG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sweetbite_backend', 'db_config.py')
+
 def create_database():
     print("🍰 SweetBite MySQL Database Setup")
     print("=" * 40)
@@ -54,39 +60,38 @@ def create_database():
 
 def update_django_settings(host, port, username, password, database_name):
     """
-    Update Django settings.py with MySQL configuration
+    Write the MySQL configuration to sweetbite_backend/db_config.py, which settings.py
+    loads instead of its default DATABASES (settings.py itself is never edited)
     """
-    settings_file = "sweetbite_backend/settings.py"
-    
-    # Read current settings
-    with open(settings_file, 'r') as f:
-        content = f.read()
-    
-    # Update database configuration
-    new_db_config = f'''DATABASES = {{
-    'default': {{
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': '{database_name}',
-        'USER': '{username}',
-        'PASSWORD': '{password}',
-        'HOST': '{host}',
-        'PORT': '{port}',
-        'OPTIONS': {{
-            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
-        }},
-    }}
-}}'''
-    
-    # Replace the database configuration
-    import re
-    pattern = r"DATABASES = \{[^}]+\}"
-    updated_content = re.sub(pattern, new_db_config, content, flags=re.DOTALL)
+    databases = {
+        'default': {
+            'ENGINE': 'django.db.backends.mysql',
+            'NAME': database_name,
+            'USER': username,
+            'PASSWORD': password,
+            'HOST': host,
+            'PORT': str(port),
+            # Keep connections open between requests instead of reconnecting each time
+            'CONN_MAX_AGE': 60,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+                'charset': 'utf8mb4',
+            },
+        }
+    }
+    content = (
+        '"""\nLocal database configuration written by create_database.py (not committed)\n"""\n\n'
+        f'DATABASES = {pprint.pformat(databases, sort_dicts=False)}\n'
+    )
     
-    # Write updated settings
-    with open(settings_file, 'w') as f:
-        f.write(updated_content)
+    # Write to a temporary file next to the target and swap it in, so a crash never leaves a partial config
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(DB_CONFIG_FILE), suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, DB_CONFIG_FILE)
     
-    print(f"✅ Updated Django settings with MySQL configuration")
+    print(f"✅ Wrote MySQL configuration to {DB_CONFIG_FILE}")
 
 if __name__ == "__main__":
     create_database()
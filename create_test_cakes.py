@@ -11,6 +11,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sweetbite_backend.settings')
 django.setup()
 
 from cakes.models import Cake, Category
+from cakes.signals import clear_cake_list_cache, clear_category_list_cache
 
 def create_test_categories():
     """Create test categories first"""
@@ -24,17 +25,29 @@ def create_test_categories():
         {'name': 'Specialty', 'description': 'Special occasion cakes', 'icon': '✨'},
     ]
     
-    created_count = 0
+    # Look up existing names once and insert the missing categories in one statement
+    existing_names = set(Category.objects.filter(
+        name__in=[cat_data['name'] for cat_data in categories_data]
+    ).values_list('name', flat=True))
+    new_categories = []
     for cat_data in categories_data:
-        if not Category.objects.filter(name=cat_data['name']).exists():
-            try:
-                category = Category.objects.create(**cat_data)
-                print(f'✅ Created category: {category.name}')
-                created_count += 1
-            except Exception as e:
-                print(f'❌ Error creating {cat_data["name"]}: {e}')
-        else:
+        if cat_data['name'] in existing_names:
             print(f'⚠️  Category already exists: {cat_data["name"]}')
+        else:
+            new_categories.append(Category(**cat_data))
+    
+    created_count = 0
+    if new_categories:
+        try:
+            # name is unique, so a category created concurrently since the lookup is skipped, not an error
+            Category.objects.bulk_create(new_categories, ignore_conflicts=True)
+            # bulk_create skips post_save, so invalidate the cached lists explicitly
+            clear_category_list_cache(sender=Category)
+            for category in new_categories:
+                print(f'✅ Created category: {category.name}')
+            created_count = len(new_categories)
+        except Exception as e:
+            print(f'❌ Error creating categories: {e}')
     
     print(f'Categories created: {created_count}')
     return Category.objects.all()
@@ -93,17 +106,28 @@ def create_test_cakes():
     created_count = 0
     existing_count = 0
     
+    # Look up existing names once and insert the missing cakes in one statement
+    existing_names = set(Cake.objects.filter(
+        name__in=[cake_data['name'] for cake_data in cakes_data]
+    ).values_list('name', flat=True))
+    new_cakes = []
     for cake_data in cakes_data:
-        if not Cake.objects.filter(name=cake_data['name']).exists():
-            try:
-                cake = Cake.objects.create(**cake_data)
-                print(f'✅ Created: {cake.name} - RS {cake.price}')
-                created_count += 1
-            except Exception as e:
-                print(f'❌ Error creating {cake_data["name"]}: {e}')
-        else:
+        if cake_data['name'] in existing_names:
             print(f'⚠️  Already exists: {cake_data["name"]}')
             existing_count += 1
+        else:
+            new_cakes.append(Cake(**cake_data))
+    
+    if new_cakes:
+        try:
+            Cake.objects.bulk_create(new_cakes)
+            # bulk_create skips post_save, so invalidate the cached cake lists explicitly
+            clear_cake_list_cache(sender=Cake)
+            for cake in new_cakes:
+                print(f'✅ Created: {cake.name} - RS {cake.price}')
+            created_count = len(new_cakes)
+        except Exception as e:
+            print(f'❌ Error creating cakes: {e}')
     
     print(f'\n📊 Summary:')
     print(f'  New cakes created: {created_count}')
@@ -16,9 +16,12 @@ from orders.models import Order, OrderItem, ShippingAddress
 from cakes.models import Cake, Category
 from feedback.models import Feedback
 from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
 
+@transaction.atomic
 def create_test_data():
-    """Create test user, order, and feedback"""
+    """Create test user, order, and feedback (in one transaction, so a failed step leaves nothing behind)"""
     print("🧪 Creating Test Data for Feedback Edit/Delete")
     print("=" * 60)
     
@@ -28,14 +31,13 @@ def create_test_data():
             username='feedback_test_user',
             defaults={
                 'email': 'feedback_test@example.com',
-                'password': 'testpass123',
+                # Hash up front so the user is written once
+                'password': make_password('testpass123'),
                 'first_name': 'Feedback',
                 'last_name': 'Test'
             }
         )
         if created:
-            user.set_password('testpass123')
-            user.save()
             print(f"✅ Created test user: {user.username}")
         else:
             print(f"✅ Using existing test user: {user.username}")
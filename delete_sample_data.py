@@ -6,6 +6,9 @@ This will remove sample data while preserving core system data like admin users
 
 import os
 import sys
+import argparse
+import operator
+from functools import reduce
 import django
 from django.db import transaction
 
@@ -16,9 +19,13 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sweetbite_backend.settings')
 django.setup()
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.color import no_style
+from django.db import connection
 from django.db.models import Q
-from orders.models import Order, OrderItem, ShippingAddress, Payment, OrderStatusHistory, DeliveryLocationHistory
+from orders.models import Order, OrderItem, ShippingAddress, Payment, OrderStatusHistory, DeliveryLocationHistory, CustomerOrderStats
 from cakes.models import Category, CakeSize, CakeShape, Frosting, Topping, Cake, CustomCake, Review
 from inventory.models import Supplier, Ingredient, StockMovement, PurchaseOrder, PurchaseOrderItem, Recipe, RecipeIngredient
 from offers.models import Offer
@@ -27,6 +34,63 @@ from seasonal_trends.models import SeasonalEvent
 
 User = get_user_model()
 
+# Name/description prefixes and order/PO/stock reference prefixes that mark sample rows
+SAMPLE_PREFIXES = ('Sample', 'Test')
+REFERENCE_PREFIXES = ('SAMPLE-', 'TEST-')
+
+def prefix_q(field, prefixes=SAMPLE_PREFIXES):
+    """OR of field__startswith lookups, one per prefix (each stays an index-friendly LIKE 'prefix%')"""
+    return reduce(operator.or_, (Q(**{f'{field}__startswith': prefix}) for prefix in prefixes))
+
+def delete_and_count(queryset):
+    """
+    Delete a queryset (cascades and signals included) in one pass and return
+    how many rows of the queryset's own model were removed
+    """
+    _, deleted_per_model = queryset.delete()
+    return deleted_per_model.get(queryset.model._meta.label, 0)
+
+# Tables emptied wholesale by --truncate (users are always kept so admins survive)
+TRUNCATE_MODELS = (
+    Order, OrderItem, ShippingAddress, Payment, OrderStatusHistory, DeliveryLocationHistory, CustomerOrderStats,
+    Category, CakeSize, CakeShape, Frosting, Topping, Cake, CustomCake, Review,
+    Supplier, Ingredient, StockMovement, PurchaseOrder, PurchaseOrderItem, Recipe, RecipeIngredient,
+    Offer, SeasonalEvent,
+)
+
+def truncate_tables():
+    """Collect the tables behind TRUNCATE_MODELS plus every table that depends on them"""
+    tables = set()
+    pending = list(TRUNCATE_MODELS)
+    while pending:
+        model = pending.pop()
+        if model is User or model._meta.db_table in tables:
+            continue
+        tables.add(model._meta.db_table)
+        # Many-to-many join tables and rows pointing at this model must go too
+        tables.update(
+            field.remote_field.through._meta.db_table
+            for field in model._meta.local_many_to_many
+        )
+        pending.extend(related.related_model for related in model._meta.related_objects)
+    return sorted(tables)
+
+def truncate_sample_data():
+    """
+    Empty every sample-data table in one flush (TRUNCATE ... CASCADE on PostgreSQL, TRUNCATE
+    with FOREIGN_KEY_CHECKS disabled on MySQL). Only for DEBUG databases: it removes real rows too
+    """
+    if not settings.DEBUG:
+        raise RuntimeError("--truncate is only allowed when DEBUG is on; use the filtered cleanup in production")
+    
+    tables = truncate_tables()
+    print(f"🧹 Truncating {len(tables)} tables...")
+    sql_list = connection.ops.sql_flush(no_style(), tables, reset_sequences=True, allow_cascade=True)
+    connection.ops.execute_sql_flush(sql_list)
+    # Cached catalog responses would otherwise outlive the rows they describe
+    cache.clear()
+    print("✅ Tables truncated; users were kept")
+
 def delete_sample_data():
     """Delete all sample data from the database"""
     
@@ -36,13 +100,11 @@ def delete_sample_data():
         # 1. Delete sample orders and related data
         print("\n📦 Deleting sample orders...")
         sample_orders = Order.objects.filter(
-            Q(order_number__startswith='SAMPLE-') |
-            Q(order_number__startswith='TEST-') |
+            prefix_q('order_number', REFERENCE_PREFIXES) |
             Q(customer__username__startswith='test_') |
             Q(customer__email__endswith='@test.com')
         )
-        order_count = sample_orders.count()
-        sample_orders.delete()
+        order_count = delete_and_count(sample_orders)
         print(f"   ✅ Deleted {order_count} sample orders")
         
         # 2. Delete sample customers (but keep admin users)
@@ -57,81 +119,63 @@ def delete_sample_data():
             Q(username='admin') |
             Q(email='admin@admin.com')
         )
-        user_count = sample_users.count()
-        sample_users.delete()
+        user_count = delete_and_count(sample_users)
         print(f"   ✅ Deleted {user_count} sample users")
         
         # 3. Delete sample cakes
         print("\n🎂 Deleting sample cakes...")
         sample_cakes = Cake.objects.filter(
-            Q(name__startswith='Sample') |
-            Q(name__startswith='Test') |
-            Q(description__startswith='Sample') |
-            Q(description__startswith='Test')
+            prefix_q('name') |
+            prefix_q('description')
         )
-        cake_count = sample_cakes.count()
-        sample_cakes.delete()
+        cake_count = delete_and_count(sample_cakes)
         print(f"   ✅ Deleted {cake_count} sample cakes")
         
         # 4. Delete sample ingredients
         print("\n🥚 Deleting sample ingredients...")
         sample_ingredients = Ingredient.objects.filter(
-            Q(name__startswith='Sample') |
-            Q(name__startswith='Test') |
-            Q(description__startswith='Sample') |
-            Q(description__startswith='Test')
+            prefix_q('name') |
+            prefix_q('description')
         )
-        ingredient_count = sample_ingredients.count()
-        sample_ingredients.delete()
+        ingredient_count = delete_and_count(sample_ingredients)
         print(f"   ✅ Deleted {ingredient_count} sample ingredients")
         
         # 5. Delete sample suppliers
         print("\n🏢 Deleting sample suppliers...")
         sample_suppliers = Supplier.objects.filter(
-            Q(name__startswith='Sample') |
-            Q(name__startswith='Test') |
+            prefix_q('name') |
             Q(contact_person__startswith='Test') |
             Q(email__endswith='@test.com')
         )
-        supplier_count = sample_suppliers.count()
-        sample_suppliers.delete()
+        supplier_count = delete_and_count(sample_suppliers)
         print(f"   ✅ Deleted {supplier_count} sample suppliers")
         
         # 6. Delete sample stock movements
         print("\n📊 Deleting sample stock movements...")
         sample_movements = StockMovement.objects.filter(
-            Q(reference__startswith='SAMPLE-') |
-            Q(reference__startswith='TEST-') |
-            Q(notes__startswith='Sample') |
-            Q(notes__startswith='Test')
+            prefix_q('reference', REFERENCE_PREFIXES) |
+            prefix_q('notes')
         )
-        movement_count = sample_movements.count()
-        sample_movements.delete()
+        movement_count = delete_and_count(sample_movements)
         print(f"   ✅ Deleted {movement_count} sample stock movements")
         
         # 7. Delete sample offers
         print("\n🎁 Deleting sample offers...")
         sample_offers = Offer.objects.filter(
-            Q(title__startswith='Sample') |
-            Q(title__startswith='Test') |
+            prefix_q('title') |
             Q(title__startswith='Promotion for') |
-            Q(description__startswith='Sample') |
-            Q(description__startswith='Test')
+            prefix_q('description')
         )
-        offer_count = sample_offers.count()
-        sample_offers.delete()
+        offer_count = delete_and_count(sample_offers)
         print(f"   ✅ Deleted {offer_count} sample offers")
         
         # 8. Delete sample seasonal events
         print("\n📅 Deleting sample seasonal events...")
         sample_events = SeasonalEvent.objects.filter(
-            Q(name__startswith='Sample') |
-            Q(name__startswith='Test') |
-            Q(description__startswith='Sample') |
-            Q(description__startswith='Test')
+            prefix_q('name') |
+            prefix_q('description')
         )
-        event_count = sample_events.count()
-        sample_events.delete()
+        event_count = delete_and_count(sample_events)
         print(f"   ✅ Deleted {event_count} sample seasonal events")
         
         # 9. Skip analytics data (no AnalyticsData model exists)
@@ -139,12 +183,10 @@ def delete_sample_data():
         # 10. Delete sample reviews
         print("\n⭐ Deleting sample reviews...")
         sample_reviews = Review.objects.filter(
-            Q(comment__startswith='Sample') |
-            Q(comment__startswith='Test') |
+            prefix_q('comment') |
             Q(user__username__startswith='test_')
         )
-        review_count = sample_reviews.count()
-        sample_reviews.delete()
+        review_count = delete_and_count(sample_reviews)
         print(f"   ✅ Deleted {review_count} sample reviews")
         
         # 11. Skip custom cakes (no user field to filter by)
@@ -152,25 +194,19 @@ def delete_sample_data():
         # 12. Delete sample purchase orders
         print("\n🛒 Deleting sample purchase orders...")
         sample_purchase_orders = PurchaseOrder.objects.filter(
-            Q(po_number__startswith='SAMPLE-') |
-            Q(po_number__startswith='TEST-') |
-            Q(supplier__name__startswith='Sample') |
-            Q(supplier__name__startswith='Test')
+            prefix_q('po_number', REFERENCE_PREFIXES) |
+            prefix_q('supplier__name')
         )
-        po_count = sample_purchase_orders.count()
-        sample_purchase_orders.delete()
+        po_count = delete_and_count(sample_purchase_orders)
         print(f"   ✅ Deleted {po_count} sample purchase orders")
         
         # 13. Delete sample recipes
         print("\n📖 Deleting sample recipes...")
         sample_recipes = Recipe.objects.filter(
-            Q(name__startswith='Sample') |
-            Q(name__startswith='Test') |
-            Q(description__startswith='Sample') |
-            Q(description__startswith='Test')
+            prefix_q('name') |
+            prefix_q('description')
         )
-        recipe_count = sample_recipes.count()
-        sample_recipes.delete()
+        recipe_count = delete_and_count(sample_recipes)
         print(f"   ✅ Deleted {recipe_count} sample recipes")
         
         # 14. Clean up any remaining sample categories, sizes, shapes, etc.
@@ -178,47 +214,37 @@ def delete_sample_data():
         
         # Delete sample categories
         sample_categories = Category.objects.filter(
-            Q(name__startswith='Sample') |
-            Q(name__startswith='Test')
+            prefix_q('name')
         )
-        category_count = sample_categories.count()
-        sample_categories.delete()
+        category_count = delete_and_count(sample_categories)
         print(f"   ✅ Deleted {category_count} sample categories")
         
         # Delete sample cake sizes
         sample_sizes = CakeSize.objects.filter(
-            Q(name__startswith='Sample') |
-            Q(name__startswith='Test')
+            prefix_q('name')
         )
-        size_count = sample_sizes.count()
-        sample_sizes.delete()
+        size_count = delete_and_count(sample_sizes)
         print(f"   ✅ Deleted {size_count} sample cake sizes")
         
         # Delete sample cake shapes
         sample_shapes = CakeShape.objects.filter(
-            Q(name__startswith='Sample') |
-            Q(name__startswith='Test')
+            prefix_q('name')
         )
-        shape_count = sample_shapes.count()
-        sample_shapes.delete()
+        shape_count = delete_and_count(sample_shapes)
         print(f"   ✅ Deleted {shape_count} sample cake shapes")
         
         # Delete sample frostings
         sample_frostings = Frosting.objects.filter(
-            Q(name__startswith='Sample') |
-            Q(name__startswith='Test')
+            prefix_q('name')
         )
-        frosting_count = sample_frostings.count()
-        sample_frostings.delete()
+        frosting_count = delete_and_count(sample_frostings)
         print(f"   ✅ Deleted {frosting_count} sample frostings")
         
         # Delete sample toppings
         sample_toppings = Topping.objects.filter(
-            Q(name__startswith='Sample') |
-            Q(name__startswith='Test')
+            prefix_q('name')
         )
-        topping_count = sample_toppings.count()
-        sample_toppings.delete()
+        topping_count = delete_and_count(sample_toppings)
         print(f"   ✅ Deleted {topping_count} sample toppings")
     
     print("\n🎉 Sample data cleanup completed successfully!")
@@ -246,8 +272,18 @@ def delete_sample_data():
     print("\n✅ Database is now clean and ready for real data!")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete sample data from the SweetBites database")
+    parser.add_argument(
+        '--truncate', action='store_true',
+        help="empty the sample-data tables entirely (DEBUG databases only) instead of deleting matching rows"
+    )
+    args = parser.parse_args()
+    
     try:
-        delete_sample_data()
+        if args.truncate:
+            truncate_sample_data()
+        else:
+            delete_sample_data()
     except Exception as e:
         print(f"❌ Error during cleanup: {str(e)}")
         sys.exit(1)
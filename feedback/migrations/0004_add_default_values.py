@@ -2,6 +2,47 @@
 
 from django.db import migrations
 
+
+def flag_columns_exist(schema_editor):
+    """
+    Whether the feedback table already has is_featured/is_verified. They were added by hand on
+    the original database before 0005 added them to the schema; a fresh database (including
+    the test database) gets them from 0005, so there is nothing to patch here.
+    """
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        columns = {column.name for column in connection.introspection.get_table_description(cursor, 'feedback')}
+    return {'is_featured', 'is_verified'} <= columns
+
+
+def set_default_values(apps, schema_editor):
+    if not flag_columns_exist(schema_editor):
+        return
+    if schema_editor.connection.vendor == 'mysql':
+        # One ALTER TABLE for both defaults (a single metadata lock on MySQL)
+        schema_editor.execute(
+            "ALTER TABLE feedback ALTER COLUMN is_featured SET DEFAULT 0, ALTER COLUMN is_verified SET DEFAULT 0;"
+        )
+    # Update existing NULL values to false (0) in a single pass over the table
+    schema_editor.execute(
+        "UPDATE feedback SET is_featured = COALESCE(is_featured, 0), is_verified = COALESCE(is_verified, 0) "
+        "WHERE is_featured IS NULL OR is_verified IS NULL;"
+    )
+
+
+def unset_default_values(apps, schema_editor):
+    if not flag_columns_exist(schema_editor):
+        return
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute(
+            "ALTER TABLE feedback ALTER COLUMN is_featured DROP DEFAULT, ALTER COLUMN is_verified DROP DEFAULT;"
+        )
+    schema_editor.execute(
+        "UPDATE feedback SET is_featured = NULLIF(is_featured, 0), is_verified = NULLIF(is_verified, 0) "
+        "WHERE is_featured = 0 OR is_verified = 0;"
+    )
+
+
 class Migration(migrations.Migration):
 
     dependencies = [
@@ -9,21 +50,5 @@ class Migration(migrations.Migration):
     ]
 
     operations = [
-        migrations.RunSQL(
-            "ALTER TABLE feedback ALTER COLUMN is_featured SET DEFAULT 0;",
-            reverse_sql="ALTER TABLE feedback ALTER COLUMN is_featured DROP DEFAULT;"
-        ),
-        migrations.RunSQL(
-            "ALTER TABLE feedback ALTER COLUMN is_verified SET DEFAULT 0;",
-            reverse_sql="ALTER TABLE feedback ALTER COLUMN is_verified DROP DEFAULT;"
-        ),
-        # Update existing NULL values to false (0)
-        migrations.RunSQL(
-            "UPDATE feedback SET is_featured = 0 WHERE is_featured IS NULL;",
-            reverse_sql="UPDATE feedback SET is_featured = NULL WHERE is_featured = 0;"
-        ),
-        migrations.RunSQL(
-            "UPDATE feedback SET is_verified = 0 WHERE is_verified IS NULL;",
-            reverse_sql="UPDATE feedback SET is_verified = NULL WHERE is_verified = 0;"
-        ),
+        migrations.RunPython(set_default_values, unset_default_values),
     ]
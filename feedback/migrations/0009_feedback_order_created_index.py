@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 22:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0008_alter_feedback_unique_together"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feedback",
+            index=models.Index(fields=["order", "-created_at"], name="feedback_order_created_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feedback", "0009_feedback_order_created_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feedback",
+            index=models.Index(fields=["-created_at"], name="feedback_created_idx"),
+        ),
+    ]
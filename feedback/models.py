@@ -6,6 +6,29 @@ import re
 
 User = get_user_model()
 
+REPETITIVE_CHARS_LIMIT = 7
+
+INAPPROPRIATE_WORDS = ['spam', 'fake', 'scam', 'hate']
+# Whole words only, so e.g. "scampi" or "hated" are not flagged
+INAPPROPRIATE_WORDS_RE = re.compile(
+    r'\b(?:%s)\b' % '|'.join(map(re.escape, INAPPROPRIATE_WORDS)), re.IGNORECASE
+)
+
+def has_repetitive_chars(text, limit=REPETITIVE_CHARS_LIMIT):
+    """
+    Whether text repeats one character at least limit times in a row,
+    checked in a single pass (runs of line breaks are allowed)
+    """
+    previous, run = None, 0
+    for char in text:
+        if char == previous:
+            run += 1
+            if run >= limit and char != '\n':
+                return True
+        else:
+            previous, run = char, 1
+    return False
+
 class Feedback(models.Model):
     RATING_CHOICES = [
         (1, '1 Star'),
@@ -34,21 +57,29 @@ class Feedback(models.Model):
     class Meta:
         db_table = 'feedback'
         ordering = ['-created_at']
+        indexes = [
+            # Covers the newest-feedback-for-an-order lookup in FeedbackViewSet.get_by_order
+            models.Index(fields=['order', '-created_at'], name='feedback_order_created_idx'),
+            # Lets FeedbackCursorPagination seek to each page in created_at order
+            models.Index(fields=['-created_at'], name='feedback_created_idx'),
+        ]
     
     def clean(self):
-        """Custom validation for the model"""
+        """
+        Custom validation for the model. It is not run by save(): FeedbackSerializer
+        and ModelForms (admin) call it, other writers should call full_clean() themselves
+        """
         super().clean()
         
         if self.message:
             # Check for repetitive characters
-            if re.search(r'(.)\1{6,}', self.message):
+            if has_repetitive_chars(self.message):
                 raise ValidationError({
                     'message': 'Please provide meaningful feedback without repetitive characters.'
                 })
             
             # Check for inappropriate content
-            inappropriate_words = ['spam', 'fake', 'scam', 'hate']
-            if any(word in self.message.lower() for word in inappropriate_words):
+            if INAPPROPRIATE_WORDS_RE.search(self.message):
                 raise ValidationError({
                     'message': 'Please provide constructive feedback without inappropriate language.'
                 })
@@ -59,10 +90,5 @@ class Feedback(models.Model):
                     'message': 'For low ratings, please provide at least 20 characters explaining your experience.'
                 })
     
-    def save(self, *args, **kwargs):
-        # Run clean validation before saving
-        self.clean()
-        super().save(*args, **kwargs)
-    
     def __str__(self):
         return f"Feedback from {self.user.username if self.user else 'Anonymous'} - {self.rating} stars"
\ No newline at end of file
@@ -1,55 +1,93 @@
+import copy
+from functools import cached_property
+from types import MappingProxyType
+
 from rest_framework import serializers
 from .models import Feedback
 
+# Shared by every anonymous row; read-only so no response can change it for the others
+ANONYMOUS_USER_INFO = MappingProxyType({
+    'id': None,
+    'username': None,
+    'email': None,
+    'first_name': None,
+    'last_name': None,
+    'full_name': None,
+    'display_name': 'Anonymous',
+    'is_registered': False
+})
+
 class FeedbackSerializer(serializers.ModelSerializer):
-    cake_image_url = serializers.SerializerMethodField()
-    user_info = serializers.SerializerMethodField()
-    
     class Meta:
         model = Feedback
-        fields = ['id', 'user', 'user_info', 'order', 'message', 'rating', 'cake_image', 'cake_image_url', 'created_at', 'updated_at']
+        fields = ['id', 'user', 'order', 'message', 'rating', 'cake_image', 'created_at', 'updated_at']
         read_only_fields = ['id', 'user', 'created_at', 'updated_at']
+        # The absolute URL is filled in by to_representation
+        extra_kwargs = {'cake_image': {'use_url': False}}
+    
+    def get_fields(self):
+        # The generated fields only depend on the class, so introspect the model once
+        # and give each serializer instance its own shallow copies to bind
+        cls = type(self)
+        fields = cls.__dict__.get('_field_templates')
+        if fields is None:
+            fields = cls._field_templates = super().get_fields()
+        return {name: copy.copy(field) for name, field in fields.items()}
     
-    def get_cake_image_url(self, obj):
-        if obj.cake_image:
+    def validate(self, attrs):
+        # Run the model's message checks once here, as Feedback.save() does not
+        message = attrs.get('message', getattr(self.instance, 'message', ''))
+        rating = attrs.get('rating', getattr(self.instance, 'rating', None))
+        Feedback(message=message, rating=rating).clean()
+        return attrs
+    
+    @cached_property
+    def _absolute_uri_prefix(self):
+        # Scheme and host of the request, resolved once for all rows serialized with it
+        request = self.context.get('request')
+        return request.build_absolute_uri('/')[:-1] if request else ''
+    
+    def _get_cake_image_url(self, image):
+        if image:
+            url = image.url
+            if url.startswith('/') and not url.startswith('//'):
+                return self._absolute_uri_prefix + url
+            # Already absolute (e.g. S3) or scheme-relative URLs
             request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.cake_image.url)
-            return obj.cake_image.url
+            return request.build_absolute_uri(url) if request else url
         return None
     
-    def get_user_info(self, obj):
-        if obj.user:
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Filled in directly rather than through SerializerMethodFields, saving the per-row
+        # field dispatch; both image keys share one URL
+        data['cake_image'] = data['cake_image_url'] = self._get_cake_image_url(instance.cake_image)
+        data['user_info'] = self._get_user_info(instance.user)
+        return data
+    
+    def _get_user_info(self, user):
+        if user is not None:
             return {
-                'id': obj.user.id,
-                'username': obj.user.username,
-                'email': obj.user.email,
-                'first_name': obj.user.first_name,
-                'last_name': obj.user.last_name,
-                'full_name': obj.user.get_full_name(),
-                'display_name': self._get_user_display_name(obj.user),
+                'id': user.id,
+                'username': user.username,
+                'email': user.email,
+                'first_name': user.first_name,
+                'last_name': user.last_name,
+                'full_name': user.get_full_name(),
+                'display_name': self._get_user_display_name(user),
                 'is_registered': True
             }
-        return {
-            'id': None,
-            'username': None,
-            'email': None,
-            'first_name': None,
-            'last_name': None,
-            'full_name': None,
-            'display_name': 'Anonymous',
-            'is_registered': False
-        }
+        return ANONYMOUS_USER_INFO
     
     def _get_user_display_name(self, user):
         """
         Get display name for user - full name, username, or email prefix
         """
-        if user.first_name and user.last_name:
-            return f"{user.first_name} {user.last_name}"
-        elif user.first_name:
-            return user.first_name
-        elif user.username:
+        first_name = user.first_name
+        if first_name:
+            last_name = user.last_name
+            return f"{first_name} {last_name}" if last_name else first_name
+        if user.username:
             return user.username
-        else:
-            return user.email.split('@')[0] if user.email else "User"
\ No newline at end of file
+        email = user.email
+        return email.split('@', 1)[0] if email else "User"
\ No newline at end of file
@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -86,3 +88,55 @@ class FeedbackAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['total_feedback'], 3)
         self.assertEqual(response.data['average_rating'], 4.0)
+
+    def test_feedback_by_order_needs_numeric_order_id(self):
+        self.assertEqual(self.client.get('/api/feedback/order/abc/').status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('feedback-get-by-order', args=[999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['error'], 'No feedback found for this order')
+
+    def test_feedback_stats_without_feedback(self):
+        response = self.client.get(reverse('feedback-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'total_feedback': 0, 'average_rating': 0})
+
+    def test_feedback_stats_are_public(self):
+        Feedback.objects.create(user=None, message='Good service', rating=4)
+        Feedback.objects.create(user=None, message='Lovely cakes', rating=5)
+        response = self.client.get(reverse('feedback-stats'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'total_feedback': 2, 'average_rating': 4.5})
+
+
+class FeedbackPaginationTest(APITestCase):
+    def test_cursor_walks_every_feedback_once(self):
+        # More rows than one page, several sharing a created_at
+        Feedback.objects.bulk_create([
+            Feedback(message=f'Feedback number {number}', rating=5) for number in range(60)
+        ])
+        created_at = Feedback.objects.order_by('id').first().created_at
+        Feedback.objects.filter(id__in=Feedback.objects.order_by('id').values('id')[:10]).update(created_at=created_at)
+
+        first_page = self.client.get(reverse('feedback-list')).data
+        self.assertEqual(len(first_page['results']), 50)
+        self.assertNotIn('count', first_page)
+        self.assertIsNone(first_page['previous'])
+
+        second_page = self.client.get(first_page['next']).data
+        self.assertEqual(len(second_page['results']), 10)
+        self.assertIsNone(second_page['next'])
+
+        ids = [feedback['id'] for feedback in first_page['results'] + second_page['results']]
+        self.assertEqual(ids, list(Feedback.objects.order_by('-created_at', '-id').values_list('id', flat=True)))
+
+    def test_ordering_is_limited_to_created_at(self):
+        older = Feedback.objects.create(message='Older feedback', rating=2)
+        Feedback.objects.create(message='Newer feedback', rating=5)
+        Feedback.objects.filter(pk=older.pk).update(created_at=older.created_at - timedelta(days=1))
+        url = reverse('feedback-list')
+
+        oldest_first = self.client.get(url, {'ordering': 'created_at'}).data['results']
+        self.assertEqual([feedback['message'] for feedback in oldest_first], ['Older feedback', 'Newer feedback'])
+        # Unknown ordering fields fall back to newest first
+        by_rating = self.client.get(url, {'ordering': 'rating'}).data['results']
+        self.assertEqual([feedback['message'] for feedback in by_rating], ['Newer feedback', 'Older feedback'])
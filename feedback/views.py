@@ -3,15 +3,32 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from django.db import IntegrityError
+from django.db.models import Avg, Count
 from django.shortcuts import get_object_or_404
 from .models import Feedback
 from .serializers import FeedbackSerializer
 
+class FeedbackCursorPagination(CursorPagination):
+    """
+    Newest-first pages that seek past the previous page instead of counting
+    the table and skipping an OFFSET
+    """
+    page_size = 50
+    # id breaks ties between rows created in the same instant
+    ordering = ('-created_at', '-id')
+
 class FeedbackViewSet(viewsets.ModelViewSet):
-    queryset = Feedback.objects.all()
+    # user_info reads the user of every row; order is only serialized as its id
+    queryset = Feedback.objects.select_related('user')
     serializer_class = FeedbackSerializer
     permission_classes = [AllowAny]
+    pagination_class = FeedbackCursorPagination
+    # Default for OrderingFilter, which cursor pagination then follows. Clients may only
+    # reorder by created_at, the one column the cursor can seek on through an index.
+    ordering = ['-created_at', '-id']
+    ordering_fields = ['created_at']
     
     def get_permissions(self):
         """
@@ -29,42 +46,23 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         return context
     
     def create(self, request, *args, **kwargs):
-        """Handle feedback creation with proper error handling for constraints"""
+        """Handle feedback creation, reporting database errors as a bad request"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
         try:
-            serializer = self.get_serializer(data=request.data)
-            serializer.is_valid(raise_exception=True)
-            
-            # Set user if authenticated
-            if request.user.is_authenticated:
-                serializer.save(user=request.user)
-            else:
-                serializer.save()
-                
-            headers = self.get_success_headers(serializer.data)
-            return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
-            
+            self.perform_create(serializer)
         except IntegrityError as e:
-            # Handle the unique constraint error gracefully
-            if 'feedback_user_id_order_id_e4cdcb6b_uniq' in str(e):
-                return Response(
-                    {
-                        "error": "You have already submitted feedback for this order. Each customer can only submit one feedback per order.",
-                        "code": "DUPLICATE_FEEDBACK"
-                    }, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            else:
-                return Response(
-                    {"error": f"Database error: {str(e)}"}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        except Exception as e:
             return Response(
-                {"error": f"An unexpected error occurred: {str(e)}"}, 
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {"error": f"Database error: {str(e)}"}, 
+                status=status.HTTP_400_BAD_REQUEST
             )
+        
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
     
     def perform_create(self, serializer):
+        # Set user if authenticated
         if self.request.user.is_authenticated:
             serializer.save(user=self.request.user)
         else:
@@ -101,21 +99,27 @@ class FeedbackViewSet(viewsets.ModelViewSet):
         self.perform_destroy(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
     
-    @action(detail=False, methods=['get'], url_path='order/(?P<order_id>[^/.]+)')
+    @action(detail=False, methods=['get'], url_path=r'order/(?P<order_id>\d+)')
     def get_by_order(self, request, order_id=None):
         """Get feedback for a specific order"""
-        try:
-            feedback = Feedback.objects.filter(order_id=order_id).first()
-            if feedback:
-                serializer = self.get_serializer(feedback)
-                return Response(serializer.data)
-            else:
-                return Response(
-                    {"error": "No feedback found for this order"}, 
-                    status=status.HTTP_404_NOT_FOUND
-                )
-        except Exception as e:
+        feedback = self.get_queryset().filter(order_id=order_id).first()
+        if feedback:
+            serializer = self.get_serializer(feedback)
+            return Response(serializer.data)
+        else:
             return Response(
-                {"error": f"An error occurred: {str(e)}"}, 
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+                {"error": "No feedback found for this order"}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+    
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Total number of feedback entries and their average rating. Public on purpose, like the
+        feedback list itself, which already exposes every rating to anonymous visitors.
+        """
+        stats = Feedback.objects.aggregate(total=Count('id'), average=Avg('rating'))
+        return Response({
+            'total_feedback': stats['total'],
+            'average_rating': round(float(stats['average'] or 0), 1)
+        })
\ No newline at end of file
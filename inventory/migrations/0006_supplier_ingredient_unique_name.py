@@ -0,0 +1,62 @@
+# Generated by Django 4.2.7 on 2026-10-15 22:20
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def duplicate_groups(model):
+    """
+    Rows sharing a name, as (kept row, [duplicate ids]) with the oldest row kept. Names are
+    compared ignoring case and trailing spaces, as MySQL's default collation does for the index.
+    """
+    rows_by_name = defaultdict(list)
+    for row in model.objects.order_by('id'):
+        rows_by_name[row.name.rstrip().casefold()].append(row)
+    return [(rows[0], [row.id for row in rows[1:]]) for rows in rows_by_name.values() if len(rows) > 1]
+
+
+def merge_duplicate_names(apps, schema_editor):
+    Supplier = apps.get_model('inventory', 'Supplier')
+    Ingredient = apps.get_model('inventory', 'Ingredient')
+    StockMovement = apps.get_model('inventory', 'StockMovement')
+    PurchaseOrder = apps.get_model('inventory', 'PurchaseOrder')
+    PurchaseOrderItem = apps.get_model('inventory', 'PurchaseOrderItem')
+    RecipeIngredient = apps.get_model('inventory', 'RecipeIngredient')
+
+    for supplier, duplicate_ids in duplicate_groups(Supplier):
+        Ingredient.objects.filter(supplier_id__in=duplicate_ids).update(supplier=supplier)
+        PurchaseOrder.objects.filter(supplier_id__in=duplicate_ids).update(supplier=supplier)
+        Supplier.objects.filter(id__in=duplicate_ids).delete()
+
+    for ingredient, duplicate_ids in duplicate_groups(Ingredient):
+        duplicates = Ingredient.objects.filter(id__in=duplicate_ids)
+        # The duplicates' stock movements move to the kept row, so their stock does too
+        extra_stock = duplicates.aggregate(total=models.Sum('current_stock'))['total'] or 0
+        Ingredient.objects.filter(id=ingredient.id).update(current_stock=F('current_stock') + extra_stock)
+        for model in (StockMovement, PurchaseOrderItem, RecipeIngredient):
+            model.objects.filter(ingredient_id__in=duplicate_ids).update(ingredient=ingredient)
+        duplicates.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_remove_ingredient_type'),
+    ]
+
+    operations = [
+        # Existing databases may already hold repeated names, which would fail the unique index
+        migrations.RunPython(merge_duplicate_names, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='ingredient',
+            name='name',
+            field=models.CharField(max_length=200, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='supplier',
+            name='name',
+            field=models.CharField(max_length=200, unique=True),
+        ),
+    ]
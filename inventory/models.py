@@ -5,7 +5,7 @@ User = get_user_model()
 
 
 class Supplier(models.Model):
-    name = models.CharField(max_length=200)
+    name = models.CharField(max_length=200, unique=True)
     contact_person = models.CharField(max_length=100, blank=True, null=True)
     email = models.EmailField(blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True, null=True)
@@ -32,7 +32,7 @@ class Ingredient(models.Model):
         ('boxes', 'Boxes'),
     ]
     
-    name = models.CharField(max_length=200)
+    name = models.CharField(max_length=200, unique=True)
     description = models.TextField(blank=True, null=True)
     unit = models.CharField(max_length=10, choices=UNIT_CHOICES)
     current_stock = models.DecimalField(max_digits=10, decimal_places=3, default=0)
@@ -1,3 +1,49 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class UniqueNameMigrationTest(TransactionTestCase):
+    before = [('inventory', '0005_remove_ingredient_type')]
+    after = [('inventory', '0006_supplier_ingredient_unique_name')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        # Leave the schema fully migrated for the tests that follow
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicate_names_are_merged_into_the_oldest_row(self):
+        apps = self.migrate(self.before)
+        Supplier = apps.get_model('inventory', 'Supplier')
+        Ingredient = apps.get_model('inventory', 'Ingredient')
+        StockMovement = apps.get_model('inventory', 'StockMovement')
+
+        supplier = Supplier.objects.create(name='Fresh Farm')
+        duplicate_supplier = Supplier.objects.create(name='fresh farm ')
+        flour = Ingredient.objects.create(name='Flour', unit='kg', current_stock=Decimal('5'), supplier=duplicate_supplier)
+        duplicate_flour = Ingredient.objects.create(name='Flour', unit='kg', current_stock=Decimal('2'))
+        sugar = Ingredient.objects.create(name='Sugar', unit='kg', current_stock=Decimal('3'))
+        StockMovement.objects.create(
+            ingredient=duplicate_flour, movement_type='in', quantity=Decimal('2'),
+            previous_stock=0, new_stock=Decimal('2'), unit_cost=Decimal('1.00'), total_value=Decimal('2.00')
+        )
+
+        apps = self.migrate(self.after)
+        Supplier = apps.get_model('inventory', 'Supplier')
+        Ingredient = apps.get_model('inventory', 'Ingredient')
+        self.assertEqual(list(Supplier.objects.values_list('id', flat=True)), [supplier.id])
+        self.assertEqual(
+            list(Ingredient.objects.order_by('id').values_list('id', 'current_stock', 'supplier_id')),
+            [(flour.id, Decimal('7'), supplier.id), (sugar.id, Decimal('3'), None)]
+        )
+        self.assertEqual(
+            list(apps.get_model('inventory', 'StockMovement').objects.values_list('ingredient_id', flat=True)),
+            [flour.id]
+        )
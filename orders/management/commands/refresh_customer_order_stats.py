@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from orders.models import CustomerOrderStats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-customer order count and total spent roll-up (run nightly, e.g. from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--customer',
+            type=int,
+            nargs='+',
+            dest='customer_ids',
+            help='Only refresh these customer ids (default: every customer)'
+        )
+
+    def handle(self, *args, **options):
+        customer_ids = options['customer_ids']
+        CustomerOrderStats.refresh(customer_ids)
+        
+        scope = f'{len(customer_ids)} customers' if customer_ids else 'all customers'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Refreshed order stats for {scope} ({CustomerOrderStats.objects.count()} rows)'
+            )
+        )
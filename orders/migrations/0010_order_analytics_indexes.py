@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-15 22:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0009_delete_deletedorder'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['order_status', 'created_at'], name='orders_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created_at', 'order_status'], name='orders_created_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='orderitem',
+            index=models.Index(fields=['cake', 'order'], name='order_items_cake_order_idx'),
+        ),
+    ]
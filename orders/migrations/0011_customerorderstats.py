@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-15 22:38
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def populate_customer_order_stats(apps, schema_editor):
+    Order = apps.get_model('orders', 'Order')
+    CustomerOrderStats = apps.get_model('orders', 'CustomerOrderStats')
+    rows = Order.objects.filter(customer__isnull=False).order_by().values('customer').annotate(
+        order_count=models.Count('id'),
+        total_spent=models.Sum('total_amount')
+    )
+    CustomerOrderStats.objects.bulk_create([
+        CustomerOrderStats(customer_id=row['customer'], order_count=row['order_count'], total_spent=row['total_spent'] or 0)
+        for row in rows
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_passwordresettoken'),
+        ('orders', '0010_order_analytics_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerOrderStats',
+            fields=[
+                ('customer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'customer_order_stats',
+                'indexes': [models.Index(fields=['order_count'], name='customer_order_stats_count_idx')],
+            },
+        ),
+        migrations.RunPython(populate_customer_order_stats, migrations.RunPython.noop),
+    ]
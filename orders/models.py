@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import connection, models, transaction
 from django.contrib.auth import get_user_model
 from cakes.models import Cake
 
@@ -142,6 +142,11 @@ class Order(models.Model):
     class Meta:
         db_table = 'orders'
         ordering = ['-created_at']
+        indexes = [
+            # Analytics filters combine status with a created_at window
+            models.Index(fields=['order_status', 'created_at'], name='orders_status_created_idx'),
+            models.Index(fields=['created_at', 'order_status'], name='orders_created_status_idx'),
+        ]
     
     def __str__(self):
         return f"Order #{self.order_number} - {self.customer.username}"
@@ -171,6 +176,9 @@ class OrderItem(models.Model):
     
     class Meta:
         db_table = 'order_items'
+        indexes = [
+            models.Index(fields=['cake', 'order'], name='order_items_cake_order_idx'),
+        ]
     
     def __str__(self):
         return f"{self.quantity}x {self.cake.name} - Order #{self.order.order_number}"
@@ -209,3 +217,62 @@ class DeliveryLocationHistory(models.Model):
     
     def __str__(self):
         return f"Order #{self.order.order_number} - {self.latitude}, {self.longitude}"
+
+class CustomerOrderStats(models.Model):
+    """
+    Per-customer order roll-up (order count and total spent) so loyalty features don't
+    re-aggregate every order. MySQL has no materialized views, so this table is kept in
+    sync by orders.signals instead. Queryset update() and bulk_create() send no signals,
+    so call refresh() with the affected customers after those writes, and schedule the
+    refresh_customer_order_stats management command (e.g. nightly from cron) to resync
+    anything those writes missed.
+    """
+    customer = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='order_stats')
+    order_count = models.PositiveIntegerField(default=0)
+    total_spent = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'customer_order_stats'
+        indexes = [
+            models.Index(fields=['order_count'], name='customer_order_stats_count_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.customer.username} - {self.order_count} orders"
+    
+    @classmethod
+    def refresh(cls, customer_ids=None):
+        """Recompute the roll-up for the given customers, or for everyone when customer_ids is None"""
+        orders = Order.objects.filter(customer__isnull=False).order_by()
+        stale = cls.objects.all()
+        if customer_ids is not None:
+            customer_ids = set(customer_ids)
+            orders = orders.filter(customer_id__in=customer_ids)
+        
+        stats = [
+            cls(customer_id=row['customer'], order_count=row['order_count'], total_spent=row['total_spent'] or 0)
+            for row in orders.values('customer').annotate(
+                order_count=models.Count('id'),
+                total_spent=models.Sum('total_amount')
+            )
+        ]
+        found = {row.customer_id for row in stats}
+        if customer_ids is not None:
+            # Only customers left with no orders lose their row
+            stale = stale.filter(customer_id__in=customer_ids - found)
+        else:
+            stale = stale.exclude(customer_id__in=found)
+        
+        # Upsert instead of delete + insert, so two refreshes of the same customer can't
+        # both insert the row. MySQL's ON DUPLICATE KEY UPDATE takes no conflict target.
+        unique_fields = ['customer'] if connection.features.supports_update_conflicts_with_target else None
+        with transaction.atomic():
+            stale.delete()
+            cls.objects.bulk_create(
+                stats,
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=unique_fields,
+                update_fields=['order_count', 'total_spent', 'updated_at'],
+            )
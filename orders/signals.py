@@ -1,13 +1,13 @@
 """
-Signals for automatic ingredient deduction when orders are created
+Signals for automatic ingredient deduction and customer order roll-ups when orders change
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from decimal import Decimal
 
-from orders.models import Order, OrderItem
+from orders.models import Order, OrderItem, CustomerOrderStats
 from inventory.models import Ingredient, StockMovement
 from cakes.models import Cake
 
@@ -117,6 +117,45 @@ def deduct_ingredients_for_cake(cake, quantity, order, system_user):
         print(f"Error deducting ingredients for cake '{cake.name}': {str(e)}")
 
 
+# Order fields the customer roll-up is computed from
+ORDER_STATS_FIELDS = ('customer_id', 'total_amount')
+
+
+def order_stats_snapshot(instance):
+    """
+    The order's loaded values of ORDER_STATS_FIELDS. Reads __dict__ so deferred fields
+    aren't fetched for every order loaded; a field missing here counts as changed.
+    """
+    return {field: instance.__dict__[field] for field in ORDER_STATS_FIELDS if field in instance.__dict__}
+
+
+@receiver(post_init, sender=Order)
+def remember_order_stats_fields(sender, instance, **kwargs):
+    """
+    Remember the customer and total an order was loaded with, so saves that change
+    neither skip the roll-up and reassigning it refreshes both customers
+    """
+    instance._order_stats_snapshot = order_stats_snapshot(instance)
+
+
+@receiver([post_save, post_delete], sender=Order)
+def refresh_customer_order_stats(sender, instance, created=False, **kwargs):
+    """
+    Keep the order count and total spent roll-up current for the order's customer,
+    and for its previous customer when the order was moved to someone else
+    """
+    snapshot = getattr(instance, '_order_stats_snapshot', {})
+    changed = created or kwargs['signal'] is post_delete or any(
+        field not in snapshot or snapshot[field] != getattr(instance, field)
+        for field in ORDER_STATS_FIELDS
+    )
+    if changed:
+        customer_ids = {instance.customer_id, snapshot.get('customer_id')} - {None}
+        if customer_ids:
+            CustomerOrderStats.refresh(customer_ids)
+    instance._order_stats_snapshot = order_stats_snapshot(instance)
+
+
 def create_sample_cake_ingredients():
     """
     Helper function to create sample ingredient data for cakes
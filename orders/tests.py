@@ -1,3 +1,101 @@
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
 from django.test import TestCase
+from .models import CustomerOrderStats, Order
+
+User = get_user_model()
+
+
+class CustomerOrderStatsTest(TestCase):
+    def setUp(self):
+        self.customer = User.objects.create_user(username='customer', email='customer@example.com', password='testpass123')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='testpass123')
+        self.next_number = 1
+
+    def create_order(self, customer, total='10.00'):
+        order = Order.objects.create(
+            order_number=f'ORD{self.next_number:05d}',
+            customer=customer,
+            subtotal=Decimal(total),
+            total_amount=Decimal(total)
+        )
+        self.next_number += 1
+        return order
+
+    def stats(self, customer):
+        stats = CustomerOrderStats.objects.filter(customer=customer).first()
+        return (stats.order_count, stats.total_spent) if stats else None
+
+    def test_saving_and_deleting_orders_updates_stats(self):
+        order = self.create_order(self.customer, '10.00')
+        self.create_order(self.customer, '15.50')
+        self.assertEqual(self.stats(self.customer), (2, Decimal('25.50')))
+
+        order.total_amount = Decimal('20.00')
+        order.save()
+        self.assertEqual(self.stats(self.customer), (2, Decimal('35.50')))
+
+        order.delete()
+        self.assertEqual(self.stats(self.customer), (1, Decimal('15.50')))
+
+    def test_customer_without_orders_loses_stats_row(self):
+        order = self.create_order(self.customer)
+        order.delete()
+        self.assertIsNone(self.stats(self.customer))
+
+    def test_reassigned_order_updates_old_and_new_customer(self):
+        order = self.create_order(self.customer, '10.00')
+        self.create_order(self.customer, '5.00')
+
+        order = Order.objects.get(pk=order.pk)
+        order.customer = self.other
+        order.save()
+        self.assertEqual(self.stats(self.customer), (1, Decimal('5.00')))
+        self.assertEqual(self.stats(self.other), (1, Decimal('10.00')))
+
+        order.customer = None
+        order.save()
+        self.assertEqual(self.stats(self.other), None)
+
+    def test_refresh_after_queryset_update(self):
+        order = self.create_order(self.customer, '10.00')
+        # update() sends no signals, so the roll-up is stale until refreshed
+        Order.objects.filter(pk=order.pk).update(customer=self.other)
+        self.assertEqual(self.stats(self.customer), (1, Decimal('10.00')))
+
+        CustomerOrderStats.refresh()
+        self.assertIsNone(self.stats(self.customer))
+        self.assertEqual(self.stats(self.other), (1, Decimal('10.00')))
+
+    def test_refresh_updates_existing_rows_in_place(self):
+        self.create_order(self.customer, '10.00')
+        CustomerOrderStats.refresh([self.customer.id])
+        CustomerOrderStats.refresh()
+        self.assertEqual(CustomerOrderStats.objects.count(), 1)
+        self.assertEqual(self.stats(self.customer), (1, Decimal('10.00')))
+
+    def test_status_only_save_skips_refresh(self):
+        order = self.create_order(self.customer)
+        order = Order.objects.get(pk=order.pk)
+        with mock.patch.object(CustomerOrderStats, 'refresh') as refresh:
+            order.order_status = 'delivered'
+            order.save()
+            refresh.assert_not_called()
+
+            order.total_amount = Decimal('12.00')
+            order.save()
+            refresh.assert_called_once_with({self.customer.id})
+
+    def test_refresh_command_resyncs_after_bulk_writes(self):
+        order = self.create_order(self.customer, '10.00')
+        Order.objects.filter(pk=order.pk).update(total_amount=Decimal('30.00'))
+        self.assertEqual(self.stats(self.customer), (1, Decimal('10.00')))
 
-# Create your tests here.
+        out = StringIO()
+        call_command('refresh_customer_order_stats', stdout=out)
+        self.assertEqual(self.stats(self.customer), (1, Decimal('30.00')))
+        self.assertIn('all customers', out.getvalue())
@@ -73,39 +73,11 @@ def setup_mysql_database():
 
 def update_django_settings(host, port, username, password, database_name):
     """
-    Update Django settings.py with MySQL configuration
+    Write the MySQL configuration to sweetbite_backend/db_config.py (see create_database.py)
     """
-    settings_file = Path(__file__).parent / "sweetbite_backend" / "settings.py"
-    
-    # Read current settings
-    with open(settings_file, 'r') as f:
-        content = f.read()
-    
-    # Update database configuration
-    new_db_config = f'''DATABASES = {{
-    'default': {{
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': '{database_name}',
-        'USER': '{username}',
-        'PASSWORD': '{password}',
-        'HOST': '{host}',
-        'PORT': '{port}',
-        'OPTIONS': {{
-            'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
-        }},
-    }}
-}}'''
-    
-    # Replace the database configuration
-    import re
-    pattern = r"DATABASES = \{[^}]+\}"
-    updated_content = re.sub(pattern, new_db_config, content, flags=re.DOTALL)
-    
-    # Write updated settings
-    with open(settings_file, 'w') as f:
-        f.write(updated_content)
-    
-    print(f"✅ Updated Django settings with MySQL configuration")
+    # Imported here because create_database needs PyMySQL, which may not be installed yet
+    from create_database import update_django_settings as write_db_config
+    write_db_config(host, port, username, password, database_name)
 
 if __name__ == "__main__":
     setup_mysql_database()
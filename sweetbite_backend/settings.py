@@ -87,12 +87,22 @@ DATABASES = {
         'PASSWORD': 'root',
         'HOST': 'localhost',
         'PORT': '8889',
+        # Keep connections open between requests instead of reconnecting each time
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
+            'charset': 'utf8mb4',
         },
     }
 }
 
+# Local database settings written by create_database.py / setup_mysql.py take precedence
+try:
+    from .db_config import DATABASES  # noqa: F811
+except ImportError:
+    pass
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -213,6 +223,26 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
 
+# Cache settings. Analytics, cake list, review and price responses are cached, and the
+# cache is also what invalidates them, so every server process must share one cache:
+# set REDIS_CACHE_URL (e.g. redis://localhost:6379/1, needs the redis package) when
+# running more than one process. Without it each process uses its own in-memory cache,
+# which is enough for development and the test suite.
+REDIS_CACHE_URL = os.environ.get('REDIS_CACHE_URL')
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_CACHE_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Logging
 LOGGING = {
     'version': 1,
@@ -226,4 +256,13 @@ LOGGING = {
         'handlers': ['console'],
         'level': 'INFO',
     },
+    'loggers': {
+        # Per-request tracing (analytics emails, review creation) is logged at DEBUG; keep it quiet by default
+        'analytics': {
+            'level': 'INFO',
+        },
+        'cakes': {
+            'level': 'INFO',
+        },
+    },
 }
\ No newline at end of file
@@ -0,0 +1,25 @@
+"""
+Settings for running the test suite without a MySQL server or Redis:
+
+    python manage.py test --settings=sweetbite_backend.test_settings
+
+Running the suite with the default settings tests against the configured MySQL
+database instead, which is the only way to exercise the MySQL-specific code paths.
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import BASE_DIR
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'test_db.sqlite3',
+    }
+}
+
+# Tests clear the cache, so never point them at a shared Redis
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}